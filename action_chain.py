@@ -1,4 +1,4 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional, Tuple
 from dataclasses import dataclass
 
 @dataclass
@@ -12,15 +12,26 @@ class ActionChain:
     def __init__(self):
         self.steps: List[ActionStep] = []
         self.current_step = 0
+        self._program: Optional[List[Tuple[Callable, Dict[str, Any]]]] = None
+        self._compiled_for = None
         
     def add_step(self, step: ActionStep):
         self.steps.append(step)
+        self._program = None
+        
+    def compile(self, executor):
+        """Resolve each step's action once so execution skips per-step dispatch"""
+        self._program = [(executor.resolve_action(step.action), step.params) for step in self.steps]
+        self._compiled_for = executor
         
     def execute_chain(self, executor):
         """Execute full chain of actions"""
+        if self._program is None or self._compiled_for is not executor:
+            self.compile(executor)
+            
         results = []
-        for step in self.steps:
-            result = executor.execute_action(step.action, step.params)
+        for step, (handler, params) in zip(self.steps, self._program):
+            result = handler(params)
             if not result["success"] and step.retry_strategy:
                 result = self._handle_retry(step, executor)
             results.append(result)
@@ -1,25 +1,90 @@
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Tuple
+import functools
 import logging
+import subprocess
 import pyautogui
-import keyboard
-import mouse
 import time
 import win32gui
 import win32con
+import win32clipboard
+import win_input
+import process_utils
+
+CLIPBOARD_PASTE_MIN_LENGTH = 20  # Longer strings are pasted rather than typed
+
+# Common program aliases -> executable names
+_PROGRAM_ALIASES = {
+    "paint": ("mspaint.exe", "paint.exe"),
+    "notepad": ("notepad.exe",),
+    "calculator": ("calc.exe",),
+    "explorer": ("explorer.exe",),
+    # Add more as needed
+}
+
+@functools.lru_cache(maxsize=256)
+def _split_combo(keys: str) -> Tuple[str, ...]:
+    """Split a "ctrl+c" style combo into its key names"""
+    if len(keys) <= 1:
+        return (keys,)
+    return tuple(keys.split('+'))
+
+def _catch(handler):
+    """Turn exceptions raised by an action handler into a failed action result"""
+    @functools.wraps(handler)
+    def wrapper(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return handler(self, params)
+        except Exception as e:
+            self.logger.error(f"{handler.__name__} failed: {str(e)}")
+            return {"success": False, "error": str(e)}
+    return wrapper
 
 class ActionExecutor:
-    def __init__(self, logger: logging.Logger, coordinate_system, state_manager):
+    def __init__(self, logger: logging.Logger, coordinate_system, state_manager,
+                 action_pause: float = 0.0):
         self.logger = logger
         self.coordinate_system = coordinate_system
         self.state_manager = state_manager
+        self.action_pause = action_pause  # Slept once after each action in execute_action
         pyautogui.FAILSAFE = True
+        pyautogui.PAUSE = 0  # Process-wide; pacing is applied per action instead of per pyautogui call
+        
+        # Window title -> HWND, revalidated with IsWindow before reuse
+        self._hwnd_cache: Dict[str, int] = {}
+        
+        # Dispatch table built once; execute_action is a single dict lookup
+        self._action_map = {
+            "click": self._click,
+            "type": self._type,
+            "press": self._press_key,
+            "move": self._move_mouse,
+            "drag": self._drag_mouse,
+            "wait": self._wait,
+            "focus_window": self._focus_window,
+            "launch_program": self._launch_program,
+            "stop": self._stop,
+        }
         
     def execute_action(self, action_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Execute an action with given parameters"""
+        handler = self._action_map.get(action_name)
+        if handler is None:
+            return {"success": False, "error": f"Unknown action: {action_name}"}
+        return self._run_handler(handler, params)
+        
+    def resolve_action(self, action_name: str) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        """Bind an action name to a callable(params) that runs it exactly as execute_action would"""
+        handler = self._action_map.get(action_name)
+        if handler is None:
+            return functools.partial(self.execute_action, action_name)
+        return functools.partial(self._run_handler, handler)
+        
+    def _run_handler(self, handler, params: Dict[str, Any]) -> Dict[str, Any]:
         try:
-            if action_name == "launch_program":
-                return self.launch_program(params.get("name", ""))
-            # ... other actions ...
+            result = handler(params)
+            if self.action_pause:
+                time.sleep(self.action_pause)
+            return result
             
         except Exception as e:
             self.logger.error(f"Action execution failed: {str(e)}")
@@ -30,27 +95,16 @@ class ActionExecutor:
         try:
             program_name = program_name.lower()
             
-            # Common program aliases
-            program_map = {
-                "paint": ["mspaint.exe", "paint.exe"],
-                "notepad": ["notepad.exe"],
-                "calculator": ["calc.exe"],
-                "explorer": ["explorer.exe"],
-                # Add more as needed
-            }
-            
             # Get possible executable names
-            possible_names = program_map.get(program_name, [program_name])
+            possible_names = _PROGRAM_ALIASES.get(program_name, (program_name,))
             
             # Check if already running
-            import psutil
-            for proc in psutil.process_iter(['name']):
-                if proc.info['name'].lower() in possible_names:
-                    self.logger.info(f"Program '{program_name}' is already running")
-                    return {"success": True}
+            running = process_utils.running_processes()
+            if any(name in running for name in possible_names):
+                self.logger.info(f"Program '{program_name}' is already running")
+                return {"success": True}
             
             # Try to launch program
-            import subprocess
             for exe_name in possible_names:
                 try:
                     subprocess.Popen(exe_name)
@@ -65,98 +119,139 @@ class ActionExecutor:
             self.logger.error(f"Program launch failed: {str(e)}")
             return {"success": False, "error": str(e)}
             
+    def _launch_program(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Launch program named in action parameters"""
+        return self.launch_program(params.get("name", ""))
+        
+    def _stop(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Signal that the goal is complete"""
+        return {"success": True}
+        
+    @_catch
     def _click(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Execute mouse click"""
-        try:
-            x = params.get("x", 0)
-            y = params.get("y", 0)
-            button = params.get("button", "left")
-            
-            # Convert coordinates
-            screen_x, screen_y = self.coordinate_system.to_screen_coords(x, y)
-            
-            # Move and click
-            pyautogui.moveTo(screen_x, screen_y)
+        x = params.get("x", 0)
+        y = params.get("y", 0)
+        button = params.get("button", "left")
+        duration = params.get("duration", 0.0)
+        
+        # Convert coordinates
+        screen_x, screen_y = self.coordinate_system.to_screen_coords(x, y)
+        
+        # Move and click; an animated move needs pyautogui's tweening
+        if win_input.AVAILABLE and not duration:
+            win_input.send_click_at(screen_x, screen_y, button)
+        else:
+            pyautogui.moveTo(screen_x, screen_y, duration=duration)
             pyautogui.click(button=button)
+        
+        return {"success": True}
             
-            return {"success": True}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
-            
+    @_catch
     def _type(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Type text"""
-        try:
-            text = params.get("text", "")
-            interval = params.get("interval", 0.1)
-            
-            pyautogui.typewrite(text, interval=interval)
-            return {"success": True}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        text = params.get("text", "")
+        
+        # Long text goes through the clipboard unless per-key pacing was asked for
+        if "interval" not in params and len(text) > CLIPBOARD_PASTE_MIN_LENGTH and text.isprintable():
+            self._paste_text(text)
+        else:
+            pyautogui.typewrite(text, interval=params.get("interval", 0.0))
+        return {"success": True}
             
+    def _paste_text(self, text: str):
+        """Enter text with one Ctrl+V instead of a key event per character"""
+        win32clipboard.OpenClipboard()
+        try:
+            win32clipboard.EmptyClipboard()
+            win32clipboard.SetClipboardText(text, win32con.CF_UNICODETEXT)
+        finally:
+            win32clipboard.CloseClipboard()
+        pyautogui.hotkey('ctrl', 'v')
+        
+    @_catch
     def _press_key(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Press keyboard key"""
-        try:
-            key = params.get("key", "")
-            pyautogui.press(key)
-            return {"success": True}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        keys = _split_combo(params.get("key", ""))
+        if win_input.AVAILABLE:
+            try:
+                win_input.send_hotkey(keys)
+                return {"success": True}
+            except ValueError:
+                # Key names win_input has no VK mapping for (pgdn, numlock, volumeup, ...) go through pyautogui
+                pass
+        if len(keys) > 1:
+            pyautogui.hotkey(*keys)
+        else:
+            pyautogui.press(keys[0])
+        return {"success": True}
             
+    @_catch
     def _move_mouse(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Move mouse cursor"""
-        try:
-            x = params.get("x", 0)
-            y = params.get("y", 0)
-            
-            screen_x, screen_y = self.coordinate_system.to_screen_coords(x, y)
-            pyautogui.moveTo(screen_x, screen_y)
-            
-            return {"success": True}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        x = params.get("x", 0)
+        y = params.get("y", 0)
+        duration = params.get("duration", 0.0)
+        
+        screen_x, screen_y = self.coordinate_system.to_screen_coords(x, y)
+        if win_input.AVAILABLE and not duration:
+            win_input.send_mouse_move(screen_x, screen_y)
+        else:
+            pyautogui.moveTo(screen_x, screen_y, duration=duration)
+        
+        return {"success": True}
             
+    @_catch
     def _drag_mouse(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Drag mouse"""
-        try:
-            start_x = params.get("start_x", 0)
-            start_y = params.get("start_y", 0)
-            end_x = params.get("end_x", 0)
-            end_y = params.get("end_y", 0)
-            
-            # Convert coordinates
-            start_screen_x, start_screen_y = self.coordinate_system.to_screen_coords(start_x, start_y)
-            end_screen_x, end_screen_y = self.coordinate_system.to_screen_coords(end_x, end_y)
-            
-            # Execute drag
+        start_x = params.get("start_x", 0)
+        start_y = params.get("start_y", 0)
+        end_x = params.get("end_x", 0)
+        end_y = params.get("end_y", 0)
+        duration = params.get("duration", 0.0)
+        
+        # Convert coordinates
+        (start_screen_x, start_screen_y), (end_screen_x, end_screen_y) = \
+            self.coordinate_system.to_screen_coords_batch([(start_x, start_y), (end_x, end_y)])
+        
+        # Execute drag
+        if win_input.AVAILABLE and not duration:
+            win_input.send_drag(start_screen_x, start_screen_y, end_screen_x, end_screen_y)
+        else:
             pyautogui.moveTo(start_screen_x, start_screen_y)
-            pyautogui.dragTo(end_screen_x, end_screen_y)
-            
-            return {"success": True}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+            pyautogui.dragTo(end_screen_x, end_screen_y, duration=duration)
+        
+        return {"success": True}
             
+    @_catch
     def _wait(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Wait specified time"""
-        try:
-            seconds = params.get("seconds", 1)
-            time.sleep(seconds)
-            return {"success": True}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        seconds = params.get("seconds", 1)
+        time.sleep(seconds)
+        return {"success": True}
             
+    @_catch
     def _focus_window(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Focus specified window"""
-        try:
-            title = params.get("title", "")
-            window = self.state_manager.get_window_by_title(title)
+        title = params.get("title", "")
+        hwnd = self._find_window_handle(title)
+        
+        if hwnd:
+            win32gui.SetForegroundWindow(hwnd)
+            return {"success": True}
+        else:
+            return {"success": False, "error": f"Window not found: {title}"}
             
-            if window:
-                win32gui.SetForegroundWindow(window['handle'])
-                return {"success": True}
-            else:
-                return {"success": False, "error": f"Window not found: {title}"}
-                
-        except Exception as e:
-            return {"success": False, "error": str(e)}
-  
\ No newline at end of file
+    def _find_window_handle(self, title: str):
+        """Look up a window handle by partial title, reusing cached handles while they stay valid"""
+        hwnd = self._hwnd_cache.get(title)
+        if hwnd and win32gui.IsWindow(hwnd) and title.lower() in win32gui.GetWindowText(hwnd).lower():
+            return hwnd
+            
+        window = self.state_manager.get_window_by_title(title)
+        if window:
+            self._hwnd_cache[title] = window['handle']
+            return window['handle']
+            
+        self._hwnd_cache.pop(title, None)
+        return None
@@ -1,60 +1,119 @@
-import psutil
-import pyautogui
+import weakref
+import ctypes
+from ctypes import wintypes
 import time
 import win32gui
 import win32con
 import json
 import os
+import cv2
+import numpy as np
+import mss
+import process_utils
+import template_matching
+
+CLR_INVALID = 0xFFFFFFFF  # GetPixel result for pixels outside the clipping region
+WINDOW_TEXT_BUFFER = 512
+
+_user32 = ctypes.WinDLL("user32")
+_user32.GetWindowTextW.argtypes = (wintypes.HWND, wintypes.LPWSTR, ctypes.c_int)
+_user32.GetWindowTextW.restype = ctypes.c_int
 
 class ActionVerifier:
     def __init__(self, knowledge_dir="knowledge"):
         self.knowledge_dir = knowledge_dir
+        self._sct = None  # mss grabber, created on first capture by the verifying thread
+        self._screen_hdc = None  # screen DC kept for GetPixel, acquired on first pixel read
+        self._screen_dc_finalizer = None  # weakref.finalize releasing _screen_hdc
+        self._log_fd = None  # verifications.jsonl O_APPEND descriptor, opened on first log
+        self._log_fd_finalizer = None  # weakref.finalize closing _log_fd
+        # verify_state requirement -> (relative cost, check returning an error message or None)
+        self._state_checks = {
+            "desktop_focused": (1, self._check_desktop_focused),
+            "window_active": (2, self._check_window_active),
+            "program_running": (5, self._check_program_running),
+            "text_entered": (10, self._check_text_entered),
+        }
+        # verify_action type -> bound verify_<type> method, resolved once
+        self._dispatch = {
+            name[len('verify_'):]: getattr(self, name)
+            for name in dir(type(self))
+            if name.startswith('verify_') and name != 'verify_action'
+        }
         
     def verify_action(self, action_type, params, context=None):
-        method_name = f"verify_{action_type}"
-        if hasattr(self, method_name):
-            return getattr(self, method_name)(params, context)
+        method = self._dispatch.get(action_type)
+        if method:
+            return method(params, context)
         return False, "Unknown verification method"
     
     def verify_program_running(self, program_name, context=None):
-        for proc in psutil.process_iter(['name']):
-            if proc.info['name'].lower() == program_name.lower():
-                return True, f"{program_name} is running"
+        if program_name.lower() in process_utils.running_processes():
+            return True, f"{program_name} is running"
         return False, f"{program_name} is not running"
     
-    def verify_window_exists(self, window_title, context=None):
-        def callback(hwnd, windows):
-            if win32gui.IsWindowVisible(hwnd):
-                title = win32gui.GetWindowText(hwnd)
-                if window_title.lower() in title.lower():
-                    windows.append(hwnd)
-            return True
-            
+    def _enum_snapshot(self):
+        """List (hwnd, lowercase title) for every visible top-level window in one Z-order walk"""
+        # Walking GetTopWindow/GetWindow avoids a Python callback per window; titles share one buffer
+        buffer = ctypes.create_unicode_buffer(WINDOW_TEXT_BUFFER)
         windows = []
-        win32gui.EnumWindows(callback, windows)
-        
-        if windows:
+        hwnd = win32gui.GetTopWindow(0)
+        while hwnd:
+            if win32gui.GetWindowLong(hwnd, win32con.GWL_STYLE) & win32con.WS_VISIBLE:
+                length = _user32.GetWindowTextW(hwnd, buffer, WINDOW_TEXT_BUFFER)
+                windows.append((hwnd, buffer.value[:length]))
+            hwnd = win32gui.GetWindow(hwnd, win32con.GW_HWNDNEXT)
+        return [(hwnd, title.lower()) for hwnd, title in windows]
+    
+    def _foreground(self, context):
+        """Return (foreground hwnd, lowercase title), read once per verify_state call"""
+        if context is not None and context.get('foreground') is not None:
+            return context['foreground']
+        hwnd = win32gui.GetForegroundWindow()
+        foreground = (hwnd, win32gui.GetWindowText(hwnd).lower())
+        if context is not None:
+            context['foreground'] = foreground
+        return foreground
+    
+    def verify_window_exists(self, window_title, context=None):
+        target = window_title.lower()
+        if any(target in title for _, title in self._enum_snapshot()):
             return True, f"Window '{window_title}' found"
         return False, f"Window '{window_title}' not found"
     
     def verify_window_active(self, window_title, context=None):
-        active_window = win32gui.GetForegroundWindow()
-        title = win32gui.GetWindowText(active_window)
+        _, title = self._foreground(context)
         
-        if window_title.lower() in title.lower():
+        if window_title.lower() in title:
             return True, f"Window '{window_title}' is active"
         return False, f"Window '{window_title}' is not active"
     
     def verify_ui_element_exists(self, element_info, context=None):
         try:
-            location = pyautogui.locateOnScreen(
-                element_info['image_path'],
-                confidence=element_info.get('confidence', 0.9)
-            )
-            return bool(location), f"UI element {'found' if location else 'not found'}"
+            template, coarse_template = template_matching.load_template(element_info['image_path'])
+            screen_gray = self._grab_screen_gray(element_info.get('region'))
+            threshold = element_info.get('confidence', 0.9)
+            # Only existence matters here, so a confident coarse match ends the search early
+            confidence, _ = template_matching.match_template(screen_gray, template, coarse_template,
+                                                             accept=threshold)
+            found = confidence >= threshold
+            return found, f"UI element {'found' if found else 'not found'}"
         except Exception as e:
             return False, f"Error verifying UI element: {str(e)}"
     
+    def _grab_screen_gray(self, region=None):
+        """Grab the primary monitor, or an (x, y, width, height) region of it, as a grayscale frame"""
+        if self._sct is None:
+            self._sct = mss.mss()
+        if region:
+            x, y, width, height = region
+            monitor = {"left": x, "top": y, "width": width, "height": height}
+        else:
+            monitor = self._sct.monitors[1]
+        shot = self._sct.grab(monitor)
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        return cv2.cvtColor(bgra, cv2.COLOR_BGRA2GRAY)
+    
     def verify_file_exists(self, file_path, context=None):
         exists = os.path.exists(file_path)
         return exists, f"File {'exists' if exists else 'does not exist'}"
@@ -62,14 +121,72 @@ class ActionVerifier:
     def verify_pixel_color(self, params, context=None):
         x, y = params['position']
         expected_color = params['color']
-        actual_color = pyautogui.pixel(x, y)
+        actual_color = self._read_pixel(x, y)
         
-        matches = all(abs(a - b) < params.get('tolerance', 5) 
+        tolerance = params.get('tolerance', 5)
+        matches = all(abs(a - b) < tolerance 
                      for a, b in zip(actual_color, expected_color))
         return matches, f"Color {'matches' if matches else 'does not match'}"
     
+    def _verification_log_path(self):
+        return os.path.join(self.knowledge_dir, 'actions', 'verifications.jsonl')
+    
+    def _migrate_legacy_log(self):
+        """Convert a legacy verifications.json array to JSON lines once, keeping it as .bak"""
+        log_file = self._verification_log_path()
+        legacy_file = log_file[:-1]  # .jsonl -> .json
+        if not os.path.exists(legacy_file) or os.path.exists(log_file):
+            return
+        with open(legacy_file, 'r') as f:
+            entries = json.load(f)
+        tmp_file = f'{log_file}.tmp'
+        with open(tmp_file, 'w') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        os.replace(tmp_file, log_file)
+        os.replace(legacy_file, f'{legacy_file}.bak')
+    
+    def _get_pixel(self, x, y):
+        if self._screen_hdc is None:
+            self._screen_hdc = win32gui.GetDC(0)
+            # Released on close(), garbage collection or exit without keeping the verifier alive
+            self._screen_dc_finalizer = weakref.finalize(self, win32gui.ReleaseDC, 0, self._screen_hdc)
+        try:
+            return win32gui.GetPixel(self._screen_hdc, x, y)
+        except Exception:
+            return CLR_INVALID
+    
+    def _release_screen_dc(self):
+        if self._screen_hdc is not None:
+            self._screen_hdc = None
+            self._screen_dc_finalizer()
+    
+    def close(self):
+        """Release the cached screen DC and close the verification log"""
+        self._release_screen_dc()
+        if self._log_fd is not None:
+            self._log_fd = None
+            self._log_fd_finalizer()
+    
+    def _read_pixel(self, x, y):
+        """Read one screen pixel as (r, g, b) without capturing the whole screen"""
+        colorref = self._get_pixel(x, y)
+        if colorref == CLR_INVALID:
+            # The cached DC may have been invalidated (e.g. by a display mode change)
+            self._release_screen_dc()
+            colorref = self._get_pixel(x, y)
+            
+        if colorref != CLR_INVALID:
+            # COLORREF is 0x00BBGGRR
+            return colorref & 0xFF, (colorref >> 8) & 0xFF, (colorref >> 16) & 0xFF
+            
+        if self._sct is None:
+            self._sct = mss.mss()
+        b, g, r = self._sct.grab({"left": x, "top": y, "width": 1, "height": 1}).raw[:3]
+        return r, g, b
+    
     def log_verification(self, action_type, result, message):
-        log_file = os.path.join(self.knowledge_dir, 'actions', 'verifications.json')
+        """Append one entry to verifications.jsonl without re-reading earlier entries"""
         log_entry = {
             "timestamp": time.time(),
             "action_type": action_type,
@@ -77,49 +194,67 @@ class ActionVerifier:
             "message": message
         }
         
-        logs = []
-        if os.path.exists(log_file):
-            with open(log_file, 'r') as f:
-                logs = json.load(f)
-                
-        logs.append(log_entry)
-        
-        with open(log_file, 'w') as f:
-            json.dump(logs, f, indent=2) 
+        if self._log_fd is None:
+            self._migrate_legacy_log()
+            self._log_fd = os.open(self._verification_log_path(),
+                                   os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, 'O_BINARY', 0), 0o644)
+            self._log_fd_finalizer = weakref.finalize(self, os.close, self._log_fd)
+        # One unbuffered append per entry, so concurrent verifiers never interleave partial lines
+        os.write(self._log_fd, json.dumps(log_entry, separators=(',', ':')).encode('utf-8') + b'\n')
+    
+    def load_logs(self):
+        """Read every logged verification entry, one JSON object per line"""
+        self._migrate_legacy_log()
+        log_file = self._verification_log_path()
+        if not os.path.exists(log_file):
+            return []
+        with open(log_file, 'r') as f:
+            return [json.loads(line) for line in f if line.strip()]
     
     def verify_state(self, required_state, context=None):
         """Verify all required states are met before executing an action"""
         if not required_state:
             return True, "No state requirements"
-            
-        for state_type, state_value in required_state.items():
-            if state_type == "window_active":
-                success, msg = self.verify_window_active(state_value)
-                if not success:
-                    return False, f"Required window '{state_value}' not active"
-                    
-            elif state_type == "program_running":
-                success, msg = self.verify_program_running(state_value)
-                if not success:
-                    return False, f"Required program '{state_value}' not running"
-                    
-            elif state_type == "desktop_focused":
-                success = win32gui.GetForegroundWindow() == win32gui.GetDesktopWindow()
-                if not success and state_value:
-                    return False, "Desktop is not focused"
-                    
-            elif state_type == "text_entered":
-                success, msg = self.verify_text_entered(context.get('window'), context.get('expected_text'))
-                if not success and state_value:
-                    return False, msg
+        
+        # Foreground window is looked up once and shared by the checks below
+        context = dict(context or {})
+        
+        # Cheapest checks first so a failing requirement returns before the expensive ones run
+        requirements = sorted(
+            (item for item in required_state.items() if item[0] in self._state_checks),
+            key=lambda item: self._state_checks[item[0]][0]
+        )
+        for state_type, state_value in requirements:
+            error = self._state_checks[state_type][1](state_value, context)
+            if error:
+                return False, error
                     
         return True, "All state requirements met"
 
-    def verify_text_entered(self, window_title, expected_text):
+    def _check_desktop_focused(self, state_value, context):
+        if state_value and self._foreground(context)[0] != win32gui.GetDesktopWindow():
+            return "Desktop is not focused"
+    
+    def _check_window_active(self, state_value, context):
+        success, _ = self.verify_window_active(state_value, context)
+        if not success:
+            return f"Required window '{state_value}' not active"
+    
+    def _check_program_running(self, state_value, context):
+        success, _ = self.verify_program_running(state_value)
+        if not success:
+            return f"Required program '{state_value}' not running"
+    
+    def _check_text_entered(self, state_value, context):
+        success, msg = self.verify_text_entered(context.get('window'), context.get('expected_text'), context)
+        if not success and state_value:
+            return msg
+
+    def verify_text_entered(self, window_title, expected_text, context=None):
         """Verify text has been entered in a window"""
         try:
-            hwnd = win32gui.GetForegroundWindow()
-            if window_title.lower() not in win32gui.GetWindowText(hwnd).lower():
+            hwnd, title = self._foreground(context)
+            if window_title.lower() not in title:
                 return False, f"Window {window_title} not focused"
                 
             # Get text from focused control
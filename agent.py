@@ -1,30 +1,35 @@
-import traceback
+import functools
+import re
 import time
 
+# Default action to try to get out of menus/dialogs when planning fails
+_FALLBACK_ACTION = ("press", {"key": "esc"})
+
+_TITLE_LINE = re.compile(r"(?:window|title): (?=([^\n]*))")  # Lookahead so "window: title: x" yields both entries
+
+@functools.lru_cache(maxsize=8)
+def _vision_titles(vision_output: str) -> frozenset:
+    """Lowercase window/title entries from a vision description, parsed once per output"""
+    return frozenset(_TITLE_LINE.findall(vision_output.lower()))
+
 def execute_next_action(self, vision_output: str) -> bool:
     """Execute next action based on vision analysis"""
     try:
         # Get next action from LLM
         action = self.llm.plan_action(self.goal, vision_output)
         if not action or action.get("error"):
-            self.logger.error(f"Action planning failed: {action.get('error', 'Unknown error')}")
+            self.logger.error(f"Action planning failed: {action.get('error', 'Unknown error') if action else 'Unknown error'}")
             # Don't return False here - force a default action instead
-            action = {
-                "function_name": "press",
-                "parameters": {"key": "esc"}  # Default action to try to get out of menus/dialogs
-            }
+            function_name, parameters = _FALLBACK_ACTION
+        else:
+            self.logger.debug("Planned action: %s", action)
+            function_name = action.get("function_name")
+            parameters = action.get("parameters", {})
             
-        self.logger.debug(f"Planned action: {action}")
-        
-        # Execute the planned action
-        function_name = action.get("function_name")
-        parameters = action.get("parameters", {})
-        
-        if not function_name:
-            self.logger.error("No action function specified")
-            # Again, force a default action
-            function_name = "press"
-            parameters = {"key": "esc"}
+            if not function_name:
+                self.logger.error("No action function specified")
+                # Again, force a default action
+                function_name, parameters = _FALLBACK_ACTION
             
         self.logger.info(f"Executing action: {function_name} with params: {parameters}")
         result = self.action_executor.execute_action(function_name, parameters)
@@ -43,15 +48,13 @@ def execute_next_action(self, vision_output: str) -> bool:
         return True  # Always return True to prevent screenshot loop
         
     except Exception as e:
-        self.logger.error(f"Action execution failed: {str(e)}")
-        self.logger.error(traceback.format_exc())
+        self.logger.error(f"Action execution failed: {str(e)}", exc_info=True)
         # Even on error, return True to prevent screenshot loop
         return True
         
 def is_program_open(self, program: str, vision_output: str) -> bool:
     """Check if a program appears to be open based on vision output"""
     program = program.lower()
-    vision_output = vision_output.lower()
     
     # Look for program name in window titles
-    return f"window: {program}" in vision_output or f"title: {program}" in vision_output 
\ No newline at end of file
+    return any(title.startswith(program) for title in _vision_titles(vision_output)) 
\ No newline at end of file
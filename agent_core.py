@@ -1,9 +1,9 @@
 import logging
 from typing import Optional, Dict, Any
-from PIL import ImageGrab
 import time
-import traceback
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import win_events
 
 class AgentCore:
     def __init__(self, llm, executor, logger, state_manager, vision_processor):
@@ -15,7 +15,12 @@ class AgentCore:
         self.running = False
         self.last_screenshot = None
         self.screenshot_interval = 0.5  # Time between auto-screenshots
-        self.action_delay = 0.5  # Time between actions
+        self.action_delay = 0.5  # Minimum wait after an action before the screen is analyzed
+        self.settle_interval = 0.05  # Quiet time after a window event before capturing
+        self.idle_interval = 2.0  # Longest wait for windows to stop changing after an action
+        self.window_events = win_events.WindowEventWatcher() if win_events.AVAILABLE else None
+        self._vision_pool = None
+        self._next_tick = 0.0
 
     def run(self, goal: str):
         """Run agent with given goal"""
@@ -23,14 +28,22 @@ class AgentCore:
         failures = 0
         MAX_FAILURES = 3
         
+        next_analysis = None
+        self._next_tick = time.monotonic()
+        
         try:
+            if self.window_events:
+                self.window_events.start()
+                self._vision_pool = ThreadPoolExecutor(max_workers=1)
+                
             while self.running:
-                # Get vision analysis
-                analysis = self.capture_screen()
+                # Get vision analysis, reusing the one gathered after the last action
+                analysis = next_analysis or self.capture_screen()
+                next_analysis = None
                 
                 if not analysis.get("success"):
                     failures += 1
-                    self.logger.error(f"Agent execution error: {analysis.get('error')}")
+                    self.logger.error("Agent execution error: %s", analysis.get('error'))
                     
                     if failures >= MAX_FAILURES:
                         self.logger.error("Too many consecutive failures, stopping agent")
@@ -46,7 +59,7 @@ class AgentCore:
                 
                 # Execute planned action
                 if not action or action.get("error"):
-                    self.logger.error(f"Action planning failed: {action.get('error')}")
+                    self.logger.error("Action planning failed: %s", action.get('error'))
                     failures += 1
                 elif not self.executor.execute_action(action["function_name"], action.get("parameters", {})):
                     failures += 1
@@ -55,12 +68,56 @@ class AgentCore:
                     self.logger.error("Too many consecutive failures, stopping agent")
                     break
                 
-                # Small delay between actions
-                time.sleep(self.action_delay)
+                # Analyze the screen once it has reacted to the action
+                next_analysis = self._next_screen_analysis()
                 
         except Exception as e:
-            self.logger.error(f"Agent execution error: {str(e)}")
+            self.logger.error("Agent execution error: %s", e)
             self.running = False
+        finally:
+            if self.window_events:
+                self.window_events.stop()
+            if self._vision_pool:
+                self._vision_pool.shutdown(wait=False)
+                self._vision_pool = None
+
+    def _wait_until_settled(self):
+        """Block until no window event has arrived for settle_interval, capped at idle_interval"""
+        deadline = time.monotonic() + self.idle_interval
+        while time.monotonic() < deadline and self.window_events.wait(self.settle_interval):
+            pass
+
+    def _next_screen_analysis(self) -> Dict[str, Any]:
+        """Wait for the screen to react to the last action and analyze it.
+        
+        Every action first gets action_delay to land, since typing and drawing raise no
+        window event. If windows are then quiet for settle_interval, analysis of the current
+        frame starts on a worker thread; a window event before it finishes means the frame
+        was stale, so that analysis is ignored and the settled screen is analyzed instead.
+        The worker only runs the vision model: state is updated here, on the agent thread,
+        and only from the analysis that is returned.
+        """
+        if not self.window_events:
+            # Fixed-rate ticks: planning and execution time count against the interval
+            now = time.monotonic()
+            self._next_tick = max(self._next_tick + self.screenshot_interval, now)
+            time.sleep(self._next_tick - now)
+            return self.capture_screen()
+            
+        time.sleep(self.action_delay)
+        if not self.window_events.wait(self.settle_interval):
+            speculative = self._vision_pool.submit(self._analyze_screen)
+            while not speculative.done():
+                if self.window_events.wait(self.settle_interval):
+                    break
+            else:
+                return self._apply_analysis(speculative.result())
+            # Dropped if it has not started; otherwise it finishes on the worker and is ignored
+            speculative.cancel()
+            self.logger.debug("Screen changed during speculative analysis, recapturing")
+            
+        self._wait_until_settled()
+        return self.capture_screen()
 
     def stop(self):
         """Stop agent execution"""
@@ -69,21 +126,26 @@ class AgentCore:
 
     def capture_screen(self) -> Dict[str, Any]:
         """Capture and analyze current screen"""
+        return self._apply_analysis(self._analyze_screen())
+
+    def _apply_analysis(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Update state with vision info if successful"""
+        if analysis.get("success"):
+            self.state_manager.update_vision_state(analysis)
+        else:
+            self.logger.error("Vision analysis failed: %s", analysis.get('error'))
+        return analysis
+
+    def _analyze_screen(self) -> Dict[str, Any]:
+        """Run vision analysis without touching agent state, so it is safe on a worker thread"""
         try:
             # Use vision processor's capture_screen method
-            analysis = self.vision_processor.capture_screen()
-            
-            # Update state with vision info if successful
-            if analysis.get("success"):
-                self.state_manager.update_vision_state(analysis)
-                return analysis
-            else:
-                self.logger.error(f"Vision analysis failed: {analysis.get('error')}")
-                return analysis
+            return self.vision_processor.capture_screen()
             
         except Exception as e:
-            self.logger.error(f"Screen capture failed: {str(e)}")
-            self.logger.error(traceback.format_exc())
+            self.logger.error("Screen capture failed: %s", e)
+            # Traceback is only rendered when debug output is enabled
+            self.logger.debug("Screen capture traceback", exc_info=True)
             return {
                 "success": False,
                 "error": str(e),
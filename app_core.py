@@ -4,9 +4,10 @@ Core application logic and initialization
 import logging
 import sys
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime
 import os
-import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 from agent_core import AgentCore
 from llm_interface import LLMInterface
@@ -26,6 +27,9 @@ class AppCore:
         self.executor = None
         self.coord_system = None
         self.agent = None
+        # Keep-alive session for Ollama probes
+        self._http = requests.Session()
+        self._http.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
 
     def initialize_components(self):
         """Verify all components are properly initialized"""
@@ -49,19 +53,24 @@ class AppCore:
             return True
             
         except Exception as e:
-            self.logger.error(f"Component verification failed: {str(e)}")
-            self.logger.error(traceback.format_exc())
+            self.logger.error("Component verification failed: %s", e)
+            self.logger.debug("Component verification traceback", exc_info=True)
             return False
 
     def run_system_tests(self):
         """Run system startup tests"""
-        test_results = {
-            "imports": self._test_imports(),
-            "display": self._test_display(),
-            "coordinates": self._test_coordinates(),
-            "vision": self._test_vision()
+        probes = {
+            "imports": self._test_imports,
+            "display": self._test_display,
+            "coordinates": self._test_coordinates,
+            "vision": self._test_vision
         }
         
+        # Probes are independent, so startup waits for the slowest one rather than their sum
+        with ThreadPoolExecutor(max_workers=len(probes)) as pool:
+            futures = {name: pool.submit(probe) for name, probe in probes.items()}
+            test_results = {name: future.result() for name, future in futures.items()}
+        
         return test_results
 
     def _test_imports(self) -> bool:
@@ -70,7 +79,7 @@ class AppCore:
             try:
                 __import__(module)
             except ImportError:
-                self.logger.error(f"Failed to import {module}")
+                self.logger.error("Failed to import %s", module)
                 return False
         return True
 
@@ -82,21 +91,28 @@ class AppCore:
             screen_height = GetSystemMetrics(SM_CYSCREEN)
             return screen_width > 0 and screen_height > 0
         except Exception as e:
-            self.logger.error(f"Display test failed: {str(e)}")
+            self.logger.error("Display test failed: %s", e)
             return False
 
     def _test_coordinates(self) -> bool:
+        """Convert a point and check it maps back to itself against the foreground window"""
         try:
-            test_system = CoordinateSystem(self.logger)
-            return True
+            import win32gui
+            coord_system = self.coord_system or CoordinateSystem(self.logger)
+            x, y = 100, 100
+            screen_x, screen_y = coord_system.to_screen_coords(x, y)
+            hwnd = win32gui.GetForegroundWindow()
+            # With no foreground window the conversion leaves the point unchanged
+            left, top = win32gui.GetWindowRect(hwnd)[:2] if hwnd else (0, 0)
+            return (screen_x - left, screen_y - top) == (x, y)
         except Exception as e:
-            self.logger.error(f"Coordinate system test failed: {str(e)}")
+            self.logger.error("Coordinate system test failed: %s", e)
             return False
 
     def _test_vision(self) -> bool:
         """Test llama3.2-vision model availability"""
         try:
-            response = requests.get("http://localhost:11434/api/tags")
+            response = self._http.get("http://localhost:11434/api/tags")
             response.raise_for_status()
             models = response.json()
             
@@ -104,27 +120,24 @@ class AppCore:
             if isinstance(models, dict):
                 models = models.get('models', [])
             
-            available_models = [
-                model.get('name', '').split(':')[0] 
-                for model in models 
-                if isinstance(model, dict)
-            ]
-            
-            self.logger.info(f"Available models: {available_models}")
-            
-            if 'llama3.2-vision' in available_models:
-                self.vision_model = 'llama3.2-vision'
+            target = 'llama3.2-vision'
+            # Stop at the first matching name instead of collecting every model
+            if any(model.get('name', '').partition(':')[0] == target
+                   for model in models if isinstance(model, dict)):
+                self.vision_model = target
                 self.logger.info("Found llama3.2-vision model")
                 return True
             
-            self.logger.error("Required model llama3.2-vision not found")
+            available_models = [model.get('name', '').partition(':')[0] for model in models if isinstance(model, dict)]
+            self.logger.error("Required model llama3.2-vision not found (available models: %s)", available_models)
             return False
             
         except Exception as e:
-            self.logger.error(f"Vision system test failed: {str(e)}")
+            self.logger.error("Vision system test failed: %s", e)
             return False
 
     def cleanup(self):
         """Cleanup resources"""
-        if hasattr(self, 'agent'):
-            self.agent.stop() 
\ No newline at end of file
+        if self.agent:
+            self.agent.stop()
+        self._http.close() 
\ No newline at end of file
@@ -1,34 +1,51 @@
+import functools
 import json
 import os
+import re
+from collections import Counter
 from datetime import datetime
 import nltk
-from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
-import string
+
+_WORD_RE = re.compile(r"\w+")
+
+@functools.lru_cache(maxsize=None)
+def _stop_words() -> frozenset:
+    """English stopwords, loaded from the NLTK corpus once"""
+    return frozenset(stopwords.words('english'))
 
 class ContextManager:
+    _nltk_ready = False
+    
     def __init__(self, knowledge_dir="knowledge"):
         self.knowledge_dir = knowledge_dir
         self.context_dir = os.path.join(knowledge_dir, "context")
+        self._context_cache = {}  # domain -> (file mtime, parsed context, frozenset of keywords)
+        self._index_path = os.path.join(self.context_dir, "_index.json")
+        self._index = None  # domain -> (context file mtime_ns, frozenset of keywords), mirrored in _index.json
         self.ensure_nltk_data()
         
-    def ensure_nltk_data(self):
+    @classmethod
+    def ensure_nltk_data(cls):
+        # The search-path walk runs once per process, not once per instance
+        if cls._nltk_ready:
+            return
         try:
-            nltk.data.find('tokenizers/punkt')
             nltk.data.find('corpora/stopwords')
         except LookupError:
-            nltk.download('punkt')
             nltk.download('stopwords')
+        cls._nltk_ready = True
     
     def create_context(self, domain, content):
         context_file = os.path.join(self.context_dir, f"{domain}.json")
         
+        now = datetime.now().isoformat()
         context = {
             "domain": domain,
             "content": content,
             "keywords": self.extract_keywords(content),
-            "created": datetime.now().isoformat(),
-            "last_updated": datetime.now().isoformat()
+            "created": now,
+            "last_updated": now
         }
         
         if os.path.exists(context_file):
@@ -37,14 +54,91 @@ class ContextManager:
                 context["created"] = existing.get("created", context["created"])
         
         with open(context_file, 'w') as f:
-            json.dump(context, f, indent=2)
+            json.dump(context, f, separators=(',', ':'))
+        self._cache_context(domain, context_file, context)
     
-    def get_context(self, domain):
+    def _cache_context(self, domain, context_file, context):
+        stat = os.stat(context_file)
+        self._context_cache[domain] = (stat.st_mtime, context, frozenset(context['keywords']))
+        self._update_index(domain, stat.st_mtime_ns, context['keywords'])
+    
+    def _load_index(self):
+        """Return the domain -> keyword set index, re-reading only context files whose mtime changed.
+
+        Files added, edited or removed outside create_context/update_context are picked
+        up here; a directory scan costs one stat per file, not a read.
+        """
+        if self._index is None:
+            self._index = self._read_index_file()
+            
+        index_name = os.path.basename(self._index_path)
+        seen = set()
+        changed = False
+        with os.scandir(self.context_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.json') or entry.name == index_name:
+                    continue
+                domain = entry.name[:-5]
+                seen.add(domain)
+                mtime_ns = entry.stat().st_mtime_ns
+                cached = self._index.get(domain)
+                if cached is None or cached[0] != mtime_ns:
+                    with open(entry.path, 'r') as f:
+                        self._index[domain] = (mtime_ns, frozenset(json.load(f)['keywords']))
+                    changed = True
+                    
+        for domain in self._index.keys() - seen:
+            del self._index[domain]
+            changed = True
+        if changed:
+            self._save_index()
+        return {domain: keywords for domain, (_, keywords) in self._index.items()}
+    
+    def _read_index_file(self):
+        """Parse _index.json; entries without an mtime (older format) are left out and re-read"""
+        try:
+            with open(self._index_path, 'r') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {
+            domain: (entry['mtime_ns'], frozenset(entry['keywords']))
+            for domain, entry in stored.items()
+            if isinstance(entry, dict) and 'mtime_ns' in entry
+        }
+    
+    def _save_index(self):
+        with open(self._index_path, 'w') as f:
+            json.dump({domain: {"mtime_ns": mtime_ns, "keywords": sorted(keywords)}
+                       for domain, (mtime_ns, keywords) in self._index.items()}, f)
+    
+    def _update_index(self, domain, mtime_ns, keywords):
+        if self._index is None:
+            self._index = self._read_index_file()
+        entry = (mtime_ns, frozenset(keywords))
+        if self._index.get(domain) != entry:
+            self._index[domain] = entry
+            self._save_index()
+    
+    def _load_context(self, domain):
+        """Return the cached (context, keyword set) for domain, re-reading the file only when it changed"""
         context_file = os.path.join(self.context_dir, f"{domain}.json")
-        if os.path.exists(context_file):
+        try:
+            mtime = os.path.getmtime(context_file)
+        except OSError:
+            self._context_cache.pop(domain, None)
+            return None
+            
+        cached = self._context_cache.get(domain)
+        if cached is None or cached[0] != mtime:
             with open(context_file, 'r') as f:
-                return json.load(f)
-        return None
+                self._cache_context(domain, context_file, json.load(f))
+            cached = self._context_cache[domain]
+        return cached[1], cached[2]
+    
+    def get_context(self, domain):
+        loaded = self._load_context(domain)
+        return loaded[0] if loaded else None
     
     def update_context(self, domain, new_content):
         existing = self.get_context(domain)
@@ -55,35 +149,32 @@ class ContextManager:
             
             context_file = os.path.join(self.context_dir, f"{domain}.json")
             with open(context_file, 'w') as f:
-                json.dump(existing, f, indent=2)
+                json.dump(existing, f, separators=(',', ':'))
+            self._cache_context(domain, context_file, existing)
     
     def extract_keywords(self, text):
-        # Tokenize and clean text
-        tokens = word_tokenize(text.lower())
-        stop_words = set(stopwords.words('english'))
-        tokens = [w for w in tokens if w not in stop_words and w not in string.punctuation]
-        
-        # Count word frequencies
-        freq = nltk.FreqDist(tokens)
+        # Tokenize with a compiled regex; punctuation never matches \w
+        stop_words = _stop_words()
+        tokens = [w for w in _WORD_RE.findall(text.lower()) if w not in stop_words]
         
         # Return most common keywords
-        return [word for word, count in freq.most_common(10)]
+        return [word for word, count in Counter(tokens).most_common(10)]
     
     def find_relevant_contexts(self, query):
         relevant = []
         query_keywords = set(self.extract_keywords(query))
         
-        for file in os.listdir(self.context_dir):
-            if file.endswith('.json'):
-                context = self.get_context(file[:-5])  # Remove .json
-                if context:
-                    context_keywords = set(context['keywords'])
-                    overlap = len(query_keywords & context_keywords)
-                    if overlap > 0:
-                        relevant.append({
-                            "domain": context['domain'],
-                            "relevance": overlap / len(query_keywords),
-                            "content": context['content']
-                        })
+        # Rank against the keyword index; only matching contexts are read in full
+        for domain, context_keywords in self._load_index().items():
+            overlap = len(query_keywords & context_keywords)
+            if overlap > 0:
+                loaded = self._load_context(domain)
+                if loaded:
+                    context = loaded[0]
+                    relevant.append({
+                        "domain": context['domain'],
+                        "relevance": overlap / len(query_keywords),
+                        "content": context['content']
+                    })
         
         return sorted(relevant, key=lambda x: x['relevance'], reverse=True) 
\ No newline at end of file
@@ -1,24 +1,56 @@
+import ctypes
 import logging
-from typing import Tuple
-import win32gui
-import win32con
+import time
+from ctypes import wintypes
+from typing import List, Sequence, Tuple
+
+RECT_CACHE_TTL = 0.016  # Seconds (about one frame) a foreground window origin is reused
+
+_user32 = ctypes.WinDLL("user32", use_last_error=True)
+_user32.GetForegroundWindow.restype = wintypes.HWND
+_user32.GetWindowRect.argtypes = (wintypes.HWND, ctypes.POINTER(wintypes.RECT))
+_user32.GetWindowRect.restype = wintypes.BOOL
 
 class CoordinateSystem:
     def __init__(self, logger: logging.Logger):
         self.logger = logger
-        
+        self._rect = wintypes.RECT()  # Reused for every GetWindowRect call
+        self._origin_cache = None
+        self._origin_cache_hwnd = None
+        self._origin_cache_time = 0.0
+
+    def _foreground_origin(self):
+        """Return the foreground window's (left, top), or None, reusing it within one frame for the same window"""
+        now = time.monotonic()
+        hwnd = _user32.GetForegroundWindow()
+        if hwnd == self._origin_cache_hwnd and now - self._origin_cache_time < RECT_CACHE_TTL:
+            return self._origin_cache
+
+        if not hwnd:
+            origin = None
+        elif _user32.GetWindowRect(hwnd, ctypes.byref(self._rect)):
+            origin = (self._rect.left, self._rect.top)
+        else:
+            raise ctypes.WinError(ctypes.get_last_error())
+        self._origin_cache = origin
+        self._origin_cache_hwnd = hwnd
+        self._origin_cache_time = now
+        return origin
+
     def to_screen_coords(self, x: int, y: int) -> Tuple[int, int]:
         """Convert relative coordinates to screen coordinates"""
+        return self.to_screen_coords_batch([(x, y)])[0]
+
+    def to_screen_coords_batch(self, points: Sequence[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Convert several relative points with a single window-rect lookup"""
         try:
-            hwnd = win32gui.GetForegroundWindow()
-            if hwnd:
-                rect = win32gui.GetWindowRect(hwnd)
-                screen_x = rect[0] + x
-                screen_y = rect[1] + y
-                return screen_x, screen_y
+            origin = self._foreground_origin()
+            if origin:
+                left, top = origin
+                return [(left + x, top + y) for x, y in points]
             else:
                 self.logger.error("No active window for coordinate conversion")
-                return x, y
+                return list(points)
         except Exception as e:
             self.logger.error(f"Coordinate conversion failed: {str(e)}")
-            return x, y 
\ No newline at end of file
+            return list(points)
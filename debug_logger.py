@@ -9,6 +9,13 @@ class DebugLogger:
         self.name = name
         self.gui = gui
         
+        # Configure logger; a second DebugLogger with the same name reuses its handlers
+        # instead of attaching another pair, which would emit every line twice
+        self.logger = logging.getLogger(name)
+        self.logger.setLevel(logging.DEBUG)
+        if self.logger.handlers:
+            return
+            
         # Create logs directory if it doesn't exist
         if not os.path.exists(log_dir):
             os.makedirs(log_dir)
@@ -26,41 +33,56 @@ class DebugLogger:
             logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
         )
         
-        # Configure logger
-        self.logger = logging.getLogger(name)
-        self.logger.setLevel(logging.DEBUG)
         self.logger.addHandler(file_handler)
         self.logger.addHandler(console_handler)
         
-    def _log_to_gui(self, level: str, message: str):
+    @property
+    def gui(self):
+        return self._gui
+
+    @gui.setter
+    def gui(self, gui):
+        self._gui = gui
+        # Resolved once here so every log call without a GUI is a single boolean check
+        self._gui_enabled = bool(gui and hasattr(gui, 'debug_text'))
+
+    def _log_to_gui(self, level: int, message: str):
         """Log message to GUI if available"""
-        if self.gui and hasattr(self.gui, 'debug_text'):
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            log_entry = f"[{timestamp}] [{level}] {message}\n"
-            
-            try:
-                self.gui.debug_text.insert("end", log_entry)
-                if hasattr(self.gui, 'auto_scroll') and self.gui.auto_scroll.get():
-                    self.gui.debug_text.see("end")
-            except Exception as e:
-                print(f"Failed to log to GUI: {str(e)}")
+        if not self._gui_enabled or not self.logger.isEnabledFor(level):
+            return
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        log_entry = f"[{timestamp}] [{logging.getLevelName(level)}] {message}\n"
+        
+        try:
+            # Tk widgets may only be touched from the GUI thread, so hand the update to its event loop
+            self.gui.debug_text.after(0, self._append_to_gui, log_entry)
+        except Exception as e:
+            print(f"Failed to log to GUI: {str(e)}")
+
+    def _append_to_gui(self, log_entry: str):
+        try:
+            self.gui.debug_text.insert("end", log_entry)
+            if hasattr(self.gui, 'auto_scroll') and self.gui.auto_scroll.get():
+                self.gui.debug_text.see("end")
+        except Exception as e:
+            print(f"Failed to log to GUI: {str(e)}")
 
     def debug(self, message: str):
         self.logger.debug(message)
-        self._log_to_gui("DEBUG", message)
+        self._log_to_gui(logging.DEBUG, message)
 
     def info(self, message: str):
         self.logger.info(message)
-        self._log_to_gui("INFO", message)
+        self._log_to_gui(logging.INFO, message)
 
     def warning(self, message: str):
         self.logger.warning(message)
-        self._log_to_gui("WARNING", message)
+        self._log_to_gui(logging.WARNING, message)
 
     def error(self, message: str):
         self.logger.error(message)
-        self._log_to_gui("ERROR", message)
+        self._log_to_gui(logging.ERROR, message)
 
     def critical(self, message: str):
         self.logger.critical(message)
-        self._log_to_gui("CRITICAL", message) 
\ No newline at end of file
+        self._log_to_gui(logging.CRITICAL, message)
@@ -5,6 +5,8 @@ import tkinter as tk
 from datetime import datetime
 from typing import Optional
 
+MAX_BATCH_SIZE = 100  # Most queued messages written to the widget in one Tk callback
+
 class DebugManager:
     def __init__(self, logger):
         self.logger = logger
@@ -20,18 +22,26 @@ class DebugManager:
         
     def _process_logs(self):
         """Process queued log messages"""
-        while self.running:
-            try:
-                message = self.message_queue.get(timeout=0.1)
-                if self.debug_text:
-                    self.debug_text.after(0, self._update_debug_text, message)
-            except queue.Empty:
-                continue
+        # Block until a message arrives; cleanup() queues None to wake and stop the thread
+        stopping = False
+        while not stopping:
+            batch = [self.message_queue.get()]
+            # Coalesce a burst into one Tk callback instead of one per message
+            while len(batch) < MAX_BATCH_SIZE:
+                try:
+                    batch.append(self.message_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                stopping = True
+                batch = batch[:batch.index(None)]
+            if batch and self.debug_text:
+                self.debug_text.after(0, self._update_debug_text_batch, batch)
                 
-    def _update_debug_text(self, message: str):
-        """Thread-safe update of debug text"""
+    def _update_debug_text_batch(self, messages):
+        """Append several messages with a single insert and scroll"""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.debug_text.insert(tk.END, f"[{timestamp}] {message}\n")
+        self.debug_text.insert(tk.END, "".join(f"[{timestamp}] {message}\n" for message in messages))
         self.debug_text.see(tk.END)
         
     def log(self, message: str, level: str = "INFO"):
@@ -41,5 +51,6 @@ class DebugManager:
     def cleanup(self):
         """Clean up resources"""
         self.running = False
+        self.message_queue.put(None)
         if hasattr(self, 'log_thread'):
             self.log_thread.join(timeout=1.0) 
\ No newline at end of file
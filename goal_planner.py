@@ -1,22 +1,150 @@
+import functools
+import hashlib
 import json
 import os
 from datetime import datetime
-from llm_interface import LLMInterface
 from debug_logger import DebugLogger
 from context_manager import ContextManager
 from typing import List, Dict, Any, Optional
 
+# Append-only logs, one JSON record per line, relative to the knowledge directory
+BREAKDOWN_LOG = os.path.join('goals', 'breakdowns.jsonl')
+ERROR_LOG = os.path.join('errors', 'error_log.jsonl')
+SUCCESS_LOG = os.path.join('success_patterns', 'successes.jsonl')
+
+def _append_jsonl(path: str, entry: Dict[str, Any]) -> None:
+    """Append a single compact record without reading the existing log"""
+    with open(path, 'a', buffering=1 << 16) as f:
+        f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+
+def _read_jsonl(path: str):
+    with open(path, 'r') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def _migrate_json_log(jsonl_path: str) -> bool:
+    """Convert the legacy JSON-array file next to jsonl_path, keeping it as .bak; True if migrated"""
+    legacy_path = jsonl_path[:-1]  # .jsonl -> .json
+    if not os.path.exists(legacy_path) or os.path.exists(jsonl_path):
+        return False
+    with open(legacy_path, 'r') as f:
+        entries = json.load(f)
+    tmp_path = f'{jsonl_path}.tmp'
+    with open(tmp_path, 'w') as f:
+        for entry in entries:
+            f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+    os.replace(tmp_path, jsonl_path)
+    os.replace(legacy_path, f'{legacy_path}.bak')
+    return True
+
+# Step action types the fallback plans use; the planning prompt offers and _validate_steps accepts only these
+PLAN_ACTION_TYPES = {
+    "PRESS": "PRESS (keys: str) - Press a key or combination, e.g. \"win+r\"",
+    "TYPE": "TYPE (text: str, enter: bool) - Type text, optionally pressing Enter",
+    "DRAW": "DRAW - Draw on the active canvas",
+    "WAIT": "WAIT (duration: int) - Wait a number of seconds",
+}
+
+# Planning prompt text around the goal, built once at import; only the goal is glued in per call
+_PLANNING_PROMPT_HEAD = """You are an AI agent that breaks computer tasks into executable steps.
+Your goal: \""""
+_PLANNING_PROMPT_TAIL = """"
+
+Available action types:
+""" + "\n".join(f"- {usage}" for usage in PLAN_ACTION_TYPES.values()) + """
+
+Give each step a verification describing how to confirm it worked.
+
+Respond with ONLY the JSON object:
+""" + json.dumps({
+    "steps": [
+        {
+            "description": "Open the Run dialog",
+            "action": {"type": "PRESS", "params": {"keys": "win+r"}},
+            "verification": {"type": "check_window", "params": {"title": "Run"}}
+        }
+    ]
+}, indent=2)
+
+# Digest of the constant prompt text; plan cache keys extend a copy with the goal
+_PLANNING_PROMPT_DIGEST = hashlib.sha256((_PLANNING_PROMPT_HEAD + _PLANNING_PROMPT_TAIL).encode('utf-8'))
+
+@functools.lru_cache(maxsize=512)
+def _load_context_file(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a context file once per modification; mtime_ns in the key invalidates edited files"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def _plan_error(steps) -> Optional[str]:
+    """Describe why steps are not a runnable plan, or None if every step is valid"""
+    if not isinstance(steps, list) or not steps:
+        return "Plan has no list of steps"
+    for index, step in enumerate(steps):
+        if not isinstance(step, dict) or not step.get('description'):
+            return f"Plan step {index} has no description"
+        action = step.get('action')
+        if not isinstance(action, dict) or action.get('type') not in PLAN_ACTION_TYPES:
+            return f"Plan step {index} has an unknown action: {action}"
+        if not isinstance(action.get('params', {}), dict):
+            return f"Plan step {index} has non-dict action params"
+    return None
+
+def _launch_steps(command: str, window_title: str) -> List[Dict[str, Any]]:
+    """Open a program through the Run dialog"""
+    return [
+        {
+            "description": "Open the Run dialog",
+            "action": {"type": "PRESS", "params": {"keys": "win+r"}},
+            "verification": {"type": "check_window", "params": {"title": "Run"}}
+        },
+        {
+            "description": f"Type '{command}' and press Enter",
+            "action": {"type": "TYPE", "params": {"text": command, "enter": True}},
+            "verification": {"type": "check_window", "params": {"title": window_title}}
+        }
+    ]
+
+def _draw_steps() -> List[Dict[str, Any]]:
+    return [
+        {
+            "description": "Draw on the canvas",
+            "action": {"type": "DRAW", "params": {}},
+            "verification": {"type": "check_drawing", "params": {}}
+        }
+    ]
+
+# Goal keyword -> (Run dialog command, expected window title); the first keyword found wins
+_FALLBACK_PROGRAMS = {
+    "paint": ("mspaint", "Paint"),
+    "notepad": ("notepad", "Notepad"),
+}
+
+# Program keyword -> {goal keyword: builder for steps appended after the launch}
+_FALLBACK_FOLLOWUPS = {
+    "paint": {"draw": _draw_steps},
+}
+
 class GoalPlanner:
-    def __init__(self, knowledge_dir="knowledge"):
+    """Breaks goals into steps, reusing stored plans before asking the LLM.
+
+    llm is any client with generate(prompt) returning an Ollama-style {'response': text},
+    the contract GoalVerifier uses; without one, unseen goals get the keyword fallback plan.
+    """
+    def __init__(self, knowledge_dir="knowledge", llm=None):
         self.knowledge_dir = knowledge_dir
         self.ensure_knowledge_structure()
         self.logger = DebugLogger("goal_planner")
-        self.llm = LLMInterface()
+        self.llm = llm
         self.current_plan = None
         self.current_step = 0
         self.retries = 0
         self.max_retries = 3
         self.context_manager = ContextManager(knowledge_dir)
+        self.plan_cache_dir = os.path.join(knowledge_dir, 'goals', 'plan_cache')
+        os.makedirs(self.plan_cache_dir, exist_ok=True)
+        self._migrate_logs()
+        self._template_cache = self._load_plan_templates()
 
     def ensure_knowledge_structure(self):
         # Create main knowledge directory
@@ -37,19 +165,40 @@ class GoalPlanner:
             self.reset_plan()
             self.retries = 0
             
-            while self.retries < self.max_retries:
+            # Goals with the same keyword signature as a stored breakdown reuse its steps
+            signature = self._goal_signature(goal)
+            template_steps = self._template_cache.get(signature) if signature else None
+            if template_steps:
+                self.current_plan = template_steps
+                self.current_step = 0
+                self.logger.info(f"Reusing stored plan template with {len(template_steps)} steps")
+                return template_steps
+            
+            # A goal planned before skips the LLM entirely
+            cache_path = self._plan_cache_path(goal)
+            cached_steps = self._load_cached_plan(cache_path)
+            if cached_steps:
+                self.current_plan = cached_steps
+                self.current_step = 0
+                self.logger.info(f"Reusing cached plan with {len(cached_steps)} steps")
+                return cached_steps
+            
+            while self.llm and self.retries < self.max_retries:
                 try:
                     prompt = self._create_planning_prompt(goal)
                     print(f"Planning prompt: {prompt}")  # Debug print
                     response = self.llm.generate(prompt)
                     print(f"LLM response: {response}")  # Debug print
                     
-                    if response and isinstance(response, dict) and 'steps' in response:
+                    if response and isinstance(response, dict):
+                        response = json.loads(response.get('response') or '{}')
+                    if isinstance(response, dict) and 'steps' in response:
                         steps = self._validate_steps(response['steps'])
                         if steps:
                             self.current_plan = steps
                             self.current_step = 0
                             self.logger.info(f"Successfully created plan with {len(steps)} steps")
+                            self._cache_plan(cache_path, steps)
                             return steps
                             
                     self.retries += 1
@@ -59,8 +208,8 @@ class GoalPlanner:
                     self.retries += 1
                     self.logger.error(f"Error in plan generation (attempt {self.retries}/{self.max_retries}): {str(e)}")
                     
-            # If all retries failed, use fallback
-            self.logger.warning("All attempts failed, using fallback plan")
+            # If all retries failed (or no LLM is configured), use fallback
+            self.logger.warning("No valid LLM plan, using fallback plan")
             fallback_plan = self.create_fallback_steps(goal)
             print(f"Fallback plan: {fallback_plan}")  # Debug print
             if fallback_plan:
@@ -76,61 +225,140 @@ class GoalPlanner:
             self.logger.error(f"Critical error in break_down_goal: {str(e)}")
             return None
 
-    def create_fallback_steps(self, goal: str) -> List[Dict[str, Any]]:
-        """Create a simple fallback plan based on keywords in the goal."""
-        fallback_steps = []
-        
-        if "paint" in goal.lower():
-            fallback_steps.extend([
-                {
-                    "description": "Open the Run dialog",
-                    "action": {"type": "PRESS", "params": {"keys": "win+r"}},
-                    "verification": {"type": "check_window", "params": {"title": "Run"}}
-                },
-                {
-                    "description": "Type 'mspaint' and press Enter",
-                    "action": {"type": "TYPE", "params": {"text": "mspaint", "enter": True}},
-                    "verification": {"type": "check_window", "params": {"title": "Paint"}}
-                }
-            ])
+    def reset_plan(self):
+        self.current_plan = None
+        self.current_step = 0
+
+    def _validate_steps(self, steps) -> Optional[List[Dict[str, Any]]]:
+        """Return steps if every one has a description and a known action type, else None"""
+        error = _plan_error(steps)
+        if error:
+            self.logger.warning(error)
+            return None
+        return steps
+
+    def _migrate_logs(self):
+        """One-shot conversion of the old JSON-array logs to JSON lines"""
+        for log in (BREAKDOWN_LOG, ERROR_LOG, SUCCESS_LOG):
+            path = os.path.join(self.knowledge_dir, log)
+            try:
+                if _migrate_json_log(path):
+                    self.logger.info(f"Migrated {path} to JSON lines")
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Could not migrate {path}: {str(e)}")
+
+    def _goal_signature(self, goal: str) -> frozenset:
+        return frozenset(self.extract_keywords(goal))
+
+    def _load_plan_templates(self) -> Dict[frozenset, List[Dict[str, Any]]]:
+        """Index valid stored breakdowns by goal keyword signature; later entries win.
+
+        Signatures with a recorded failure (success False) are never reused; unfinished
+        plans (success None) are kept.
+        """
+        templates = {}
+        failed = set()
+        invalid = 0
+        breakdown_file = os.path.join(self.knowledge_dir, BREAKDOWN_LOG)
+        try:
+            for entry in _read_jsonl(breakdown_file):
+                if not isinstance(entry, dict) or not entry.get('goal'):
+                    continue
+                signature = self._goal_signature(entry['goal'])
+                if not signature:
+                    continue
+                if entry.get('success') is False:
+                    failed.add(signature)
+                elif _plan_error(entry.get('steps')):
+                    invalid += 1
+                else:
+                    templates[signature] = entry['steps']
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not load stored breakdowns: {str(e)}")
             
-            if "draw" in goal.lower():
-                fallback_steps.append(
-                    {
-                        "description": "Draw on the canvas",
-                        "action": {"type": "DRAW", "params": {}},
-                        "verification": {"type": "check_drawing", "params": {}}
-                    }
-                )
-                
-        elif "notepad" in goal.lower():
-            fallback_steps.extend([
-                {
-                    "description": "Open the Run dialog",
-                    "action": {"type": "PRESS", "params": {"keys": "win+r"}},
-                    "verification": {"type": "check_window", "params": {"title": "Run"}}
-                },
-                {
-                    "description": "Type 'notepad' and press Enter",
-                    "action": {"type": "TYPE", "params": {"text": "notepad", "enter": True}},
-                    "verification": {"type": "check_window", "params": {"title": "Notepad"}}
-                }
-            ])
+        if invalid:
+            self.logger.info(f"Skipped {invalid} stored breakdowns that are not runnable plans")
+        for signature in failed:
+            templates.pop(signature, None)
+        return templates
+
+    def _create_planning_prompt(self, goal: str) -> str:
+        return _PLANNING_PROMPT_HEAD + goal + _PLANNING_PROMPT_TAIL
+
+    def _plan_cache_path(self, goal: str) -> str:
+        """Cache file for a goal's planning prompt"""
+        key = _PLANNING_PROMPT_DIGEST.copy()
+        key.update(goal.encode('utf-8'))
+        return os.path.join(self.plan_cache_dir, f'{key.hexdigest()}.json')
+
+    def _load_cached_plan(self, path: str) -> Optional[List[Dict[str, Any]]]:
+        try:
+            with open(path, 'r') as f:
+                steps = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable plan cache entry {path}: {str(e)}")
+            return None
+        return self._validate_steps(steps)
+
+    def _cache_plan(self, path: str, steps: List[Dict[str, Any]]) -> None:
+        """Write the plan to a temp file and rename it so readers never see a partial entry"""
+        try:
+            tmp_path = f'{path}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(steps, f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except (OSError, TypeError) as e:
+            self.logger.warning(f"Failed to cache plan: {str(e)}")
+
+    def invalidate_plan(self, goal: str) -> None:
+        """Forget the cached plan for a goal whose plan failed, so the next attempt replans"""
+        self._template_cache.pop(self._goal_signature(goal), None)
+        try:
+            os.remove(self._plan_cache_path(goal))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger.warning(f"Failed to evict cached plan: {str(e)}")
             
-        else:
-            fallback_steps.append(
+        # Recorded in the breakdown log so the template is not reused after a restart
+        try:
+            _append_jsonl(os.path.join(self.knowledge_dir, BREAKDOWN_LOG), {
+                "goal": goal,
+                "steps": None,
+                "timestamp": datetime.now().isoformat(),
+                "success": False
+            })
+        except OSError as e:
+            self.logger.warning(f"Failed to record plan failure: {str(e)}")
+
+    def create_fallback_steps(self, goal: str) -> List[Dict[str, Any]]:
+        """Create a simple fallback plan based on keywords in the goal."""
+        goal_lower = goal.lower()
+        program = next((name for name in _FALLBACK_PROGRAMS if name in goal_lower), None)
+        if program is None:
+            return [
                 {
                     "description": "Generic action",
                     "action": {"type": "WAIT", "params": {"duration": 1}},
                     "verification": {}
                 }
-            )
+            ]
             
+        command, window_title = _FALLBACK_PROGRAMS[program]
+        fallback_steps = _launch_steps(command, window_title)
+        for keyword, followup in _FALLBACK_FOLLOWUPS.get(program, {}).items():
+            if keyword in goal_lower:
+                fallback_steps.extend(followup())
+                
         return fallback_steps
     
     def store_goal_breakdown(self, goal, steps):
         # Store in knowledge base for future reference
-        breakdown_file = os.path.join(self.knowledge_dir, 'goals', 'breakdowns.json')
+        breakdown_file = os.path.join(self.knowledge_dir, BREAKDOWN_LOG)
         entry = {
             "goal": goal,
             "steps": steps,
@@ -138,18 +366,14 @@ class GoalPlanner:
             "success": None  # To be updated when goal completes
         }
         
-        breakdowns = []
-        if os.path.exists(breakdown_file):
-            with open(breakdown_file, 'r') as f:
-                breakdowns = json.load(f)
-                
-        breakdowns.append(entry)
+        _append_jsonl(breakdown_file, entry)
         
-        with open(breakdown_file, 'w') as f:
-            json.dump(breakdowns, f, indent=2)
+        signature = self._goal_signature(goal)
+        if signature and steps:
+            self._template_cache[signature] = steps
     
     def log_error(self, error_info):
-        errors_file = os.path.join(self.knowledge_dir, 'errors', 'error_log.json')
+        errors_file = os.path.join(self.knowledge_dir, ERROR_LOG)
         error_entry = {
             "timestamp": datetime.now().isoformat(),
             "error": str(error_info.get('error')),
@@ -158,18 +382,13 @@ class GoalPlanner:
             "goal": error_info.get('goal')
         }
         
-        errors = []
-        if os.path.exists(errors_file):
-            with open(errors_file, 'r') as f:
-                errors = json.load(f)
-                
-        errors.append(error_entry)
+        _append_jsonl(errors_file, error_entry)
         
-        with open(errors_file, 'w') as f:
-            json.dump(errors, f, indent=2)
+        if error_info.get('goal'):
+            self.invalidate_plan(error_info['goal'])
     
     def log_success(self, success_info):
-        success_file = os.path.join(self.knowledge_dir, 'success_patterns', 'successes.json')
+        success_file = os.path.join(self.knowledge_dir, SUCCESS_LOG)
         success_entry = {
             "timestamp": datetime.now().isoformat(),
             "goal": success_info.get('goal'),
@@ -178,21 +397,11 @@ class GoalPlanner:
             "context": success_info.get('context')
         }
         
-        successes = []
-        if os.path.exists(success_file):
-            with open(success_file, 'r') as f:
-                successes = json.load(f)
-                
-        successes.append(success_entry)
-        
-        with open(success_file, 'w') as f:
-            json.dump(successes, f, indent=2)
+        _append_jsonl(success_file, success_entry)
     
     def extract_keywords(self, text):
         # Use ContextManager's keyword extraction
-        from context_manager import ContextManager
-        cm = ContextManager(self.knowledge_dir)
-        return cm.extract_keywords(text)
+        return self.context_manager.extract_keywords(text)
     
     def adapt_pattern_to_goal(self, pattern_steps, goal):
         # Customize pattern steps for this specific goal
@@ -218,9 +427,11 @@ class GoalPlanner:
             keywords = self.extract_keywords(goal)
             for keyword in keywords:
                 context_file = os.path.join(self.knowledge_dir, 'context', f'{keyword}.json')
-                if os.path.exists(context_file):
-                    with open(context_file, 'r') as f:
-                        context[keyword] = json.load(f)
+                try:
+                    mtime_ns = os.stat(context_file).st_mtime_ns
+                except FileNotFoundError:
+                    continue
+                context[keyword] = _load_context_file(context_file, mtime_ns)
         except Exception as e:
             self.logger.error(f"Error loading context: {str(e)}")
         return context
\ No newline at end of file
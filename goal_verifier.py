@@ -1,11 +1,44 @@
+import atexit
 import cv2
 import numpy as np
-from PIL import ImageGrab
+import mss
+import functools
+import hashlib
 import json
 import os
+import re
+from collections import OrderedDict
 from datetime import datetime
 import time
-import pyautogui
+from concurrent.futures import ThreadPoolExecutor
+import win32api
+import win32con
+import win32gui
+import process_utils
+import template_matching
+
+PAINT_TITLE_PATTERNS = ("paint", "untitled", "microsoft paint")
+VISUAL_CACHE_SIZE = 8  # Recent (frame hash, goal) -> visual check results kept
+COARSE_REJECT_CONFIDENCE = 0.6  # Coarse-level scores below this skip the full-resolution refine
+RECHECK_DELAY = 10.0  # Seconds after the first capture before a low-confidence re-check
+SCREENSHOT_JPEG_QUALITY = 85  # Verification screenshots are evidence, not lossless assets
+
+@functools.lru_cache(maxsize=64)
+def _title_matcher(patterns: tuple):
+    """Compile case-insensitive substring patterns into one regex; None matches nothing"""
+    if not patterns:
+        return None
+    return re.compile("|".join(map(re.escape, patterns)), re.IGNORECASE)
+
+@functools.lru_cache(maxsize=8)
+def _load_json_file(path: str, mtime_ns: int):
+    """Parse a JSON file once per modification; mtime_ns in the key invalidates edited files"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def _matches_any(patterns, text: str) -> bool:
+    matcher = _title_matcher(tuple(patterns))
+    return bool(matcher and matcher.search(text))
 
 class GoalVerifier:
     def __init__(self, logger, knowledge_dir="knowledge", llm=None):
@@ -14,9 +47,40 @@ class GoalVerifier:
         self.last_verification = None
         self.llm = llm
         
+        # Centered 90%-of-screen rectangle that program windows are moved to
+        screen_width = win32api.GetSystemMetrics(win32con.SM_CXSCREEN)
+        screen_height = win32api.GetSystemMetrics(win32con.SM_CYSCREEN)
+        window_width = int(screen_width * 0.9)
+        window_height = int(screen_height * 0.9)
+        self._program_window_rect = (
+            (screen_width - window_width) // 2,
+            (screen_height - window_height) // 2,
+            window_width,
+            window_height
+        )
+        
+        # Runs the process scan while the calling thread enumerates windows and grabs the screen
+        self._state_pool = ThreadPoolExecutor(max_workers=1)
+        
+        # Writes encoded screenshots to disk off the verification path
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
+        self._screenshot_params = [cv2.IMWRITE_JPEG_QUALITY, SCREENSHOT_JPEG_QUALITY]
+        
+        # Screenshots and the verification log share one directory, created once here
+        self.verification_dir = os.path.join(knowledge_dir, 'verifications')
+        os.makedirs(self.verification_dir, exist_ok=True)
+        self._verification_log = None
+        
+        # mss grabber and BGR frame buffer, created on first capture by the verifying thread
+        self._sct = None
+        self._monitor = None
+        self._frame_buf = None
+        self._visual_cache = OrderedDict()
+        
         # Load cached program info
         self.program_info_cache = {}
         self._load_program_cache()
+        self._preload_templates()
         
     def _load_program_cache(self):
         """Load cached program information"""
@@ -44,15 +108,28 @@ class GoalVerifier:
         except Exception as e:
             self.logger.error(f"Failed to load program cache: {str(e)}")
 
+    def _preload_templates(self):
+        """Decode every known verification template up front so the first check pays no PNG decode"""
+        try:
+            all_patterns = self._visual_patterns()
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Failed to read visual patterns: {str(e)}")
+            return
+            
+        for pattern_data in all_patterns.values():
+            try:
+                template_matching.load_template(pattern_data['template_path'])
+            except (KeyError, OSError, ValueError) as e:
+                self.logger.debug("Skipping template preload: %s", e)
+
     def verify_goal_completion(self, goal, current_state, expected_state=None):
         """Comprehensive goal completion verification"""
         try:
-            # Update current state
-            current_state.update(self._get_current_state())
-            
-            # Capture current screen state
-            screenshot = ImageGrab.grab()
-            screen_state = np.array(screenshot)
+            # Update current state and capture current screen state
+            screen_state = self._capture_state_and_screen(current_state)
+            captured_at = time.monotonic()
             
             # Store verification attempt
             verification_data = {
@@ -78,12 +155,13 @@ class GoalVerifier:
             # Added dynamic re-check with longer delay
             if confidence < 0.5:
                 self.logger.debug("Very low confidence, waiting and re-checking...")
-                time.sleep(10.0)  # Wait 10 seconds for updates
+                # Time spent verifying and saving the first capture counts towards the wait
+                remaining = RECHECK_DELAY - (time.monotonic() - captured_at)
+                if remaining > 0:
+                    time.sleep(remaining)
                 
                 # Update state again
-                current_state.update(self._get_current_state())
-                new_screenshot = ImageGrab.grab()
-                new_screen_state = np.array(new_screenshot)
+                new_screen_state = self._capture_state_and_screen(current_state)
                 
                 results["visual_check"] = self._verify_visual_state(new_screen_state, goal)
                 results["state_check"] = self._verify_state_requirements(current_state, expected_state)
@@ -102,6 +180,29 @@ class GoalVerifier:
             self.logger.error(f"Goal verification failed: {str(e)}")
             return False, None
             
+    def _capture_state_and_screen(self, current_state):
+        """Refresh current_state and grab the screen, overlapping the process scan with both"""
+        process_future = self._state_pool.submit(self._is_paint_running)
+        
+        # Window handling may reposition Paint, so it finishes before the capture
+        current_state.update(self._get_current_state())
+        screen_state = self._capture_screen()
+        
+        current_state["paint_open"] = process_future.result()
+        return screen_state
+            
+    def _capture_screen(self):
+        """Grab the primary monitor into the reused BGR frame buffer"""
+        if self._sct is None:
+            self._sct = mss.mss()
+            self._monitor = self._sct.monitors[1]  # Same area ImageGrab.grab() covered
+            
+        shot = self._sct.grab(self._monitor)
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        if self._frame_buf is None or self._frame_buf.shape[:2] != bgra.shape[:2]:
+            self._frame_buf = np.empty((shot.height, shot.width, 3), dtype=np.uint8)
+        return cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=self._frame_buf)
+            
     def _verify_goal_specific(self, goal, screen_state):
         """Goal-specific verification logic"""
         if "draw" in goal.lower():
@@ -115,15 +216,16 @@ class GoalVerifier:
     def _verify_drawing_present(self, screen_state):
         """Verify that drawing exists on canvas"""
         try:
-            # Convert to grayscale
+            # One grayscale pass serves both canvas detection and the pixel count
             gray = cv2.cvtColor(screen_state, cv2.COLOR_BGR2GRAY)
             
             # Check for non-white pixels in canvas area
-            canvas_area = self._detect_canvas_area(screen_state)
+            canvas_area = self._detect_canvas_area(screen_state, gray)
             if canvas_area is None:
                 return False
                 
-            non_white_pixels = np.sum(gray[canvas_area] < 250)
+            x, y, w, h = canvas_area
+            non_white_pixels = cv2.countNonZero(cv2.compare(gray[y:y+h, x:x+w], 250, cv2.CMP_LT))
             return non_white_pixels > 1000  # Arbitrary threshold
             
         except Exception as e:
@@ -148,38 +250,39 @@ class GoalVerifier:
     def _save_screenshot(self, screen_state):
         """Save screenshot to verification directory"""
         try:
-            # Create verification directory if it doesn't exist
-            verification_dir = os.path.join(self.knowledge_dir, 'verifications')
-            if not os.path.exists(verification_dir):
-                os.makedirs(verification_dir)
-            
             # Generate filename with timestamp
-            filename = f"verification_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-            filepath = os.path.join(verification_dir, filename)
-            
-            # Save screenshot
-            cv2.imwrite(filepath, screen_state)
+            filename = f"verification_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
+            filepath = os.path.join(self.verification_dir, filename)
+            
+            # Encode now, since the frame buffer is reused by the next capture; write in the background
+            ok, encoded = cv2.imencode('.jpg', screen_state, self._screenshot_params)
+            if not ok:
+                raise ValueError("JPEG encoding failed")
+            self._io_pool.submit(self._write_screenshot, filepath, encoded)
             return filepath
             
         except Exception as e:
             self.logger.error(f"Failed to save screenshot: {str(e)}")
             return None
+            
+    def _write_screenshot(self, filepath, encoded):
+        try:
+            with open(filepath, 'wb') as f:
+                f.write(encoded)
+        except OSError as e:
+            self.logger.error(f"Failed to write screenshot {filepath}: {str(e)}")
 
     def _store_verification(self, verification_data):
-        """Store verification data"""
+        """Append verification data to verifications.jsonl"""
         try:
-            # Create verification directory if it doesn't exist
-            verification_dir = os.path.join(self.knowledge_dir, 'verifications')
-            if not os.path.exists(verification_dir):
-                os.makedirs(verification_dir)
-            
-            # Generate filename with timestamp
-            filename = f"verification_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            filepath = os.path.join(verification_dir, filename)
-            
-            # Save verification data
-            with open(filepath, 'w') as f:
-                json.dump(verification_data, f, indent=2)
+            if self._verification_log is None:
+                log_path = os.path.join(self.verification_dir, 'verifications.jsonl')
+                self._verification_log = open(log_path, 'a', buffering=1 << 16)
+                atexit.register(self._verification_log.close)
+                
+            self._verification_log.write(json.dumps(verification_data, separators=(',', ':')) + '\n')
+            # One record per goal check, so flushing each keeps the log complete after a crash
+            self._verification_log.flush()
             
         except Exception as e:
             self.logger.error(f"Failed to store verification: {str(e)}")
@@ -187,51 +290,70 @@ class GoalVerifier:
     def _verify_visual_state(self, screen_state, goal):
         """Verify the visual state matches goal requirements"""
         try:
+            # An unchanged frame checked against the same goal gives the same results
+            cache_key = (hashlib.blake2b(screen_state, digest_size=8).digest(), goal)
+            if cache_key in self._visual_cache:
+                self._visual_cache.move_to_end(cache_key)
+                return self._visual_cache[cache_key]
+                
             # Convert screen state to grayscale for processing
             gray = cv2.cvtColor(screen_state, cv2.COLOR_BGR2GRAY)
             
             # Get expected visual patterns for this goal
             expected_patterns = self._load_expected_patterns(goal)
             
+            # Every template is matched against this one capture and its shared coarse level
+            coarse_gray = template_matching.pyramid_down(gray) if expected_patterns else None
+            
             results = {}
             for pattern_name, pattern_data in expected_patterns.items():
-                template = cv2.imread(pattern_data['template_path'], 0)
-                if template is None:
+                try:
+                    template, coarse_template = template_matching.load_template(pattern_data['template_path'])
+                except (OSError, ValueError):
                     continue
                     
-                # Template matching
-                res = cv2.matchTemplate(gray, template, cv2.TM_CCOEFF_NORMED)
-                min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
+                # Coarse-to-fine template matching; thresholds are tuned for TM_CCOEFF_NORMED
+                confidence, location = template_matching.match_template(
+                    gray, template, coarse_template, method=cv2.TM_CCOEFF_NORMED, coarse_screen=coarse_gray,
+                    reject=min(COARSE_REJECT_CONFIDENCE, pattern_data.get('threshold', 0.8)))
                 
                 # Check if match exceeds threshold
                 results[pattern_name] = {
-                    'matched': max_val >= pattern_data.get('threshold', 0.8),
-                    'confidence': max_val,
-                    'location': max_loc
+                    'matched': confidence >= pattern_data.get('threshold', 0.8),
+                    'confidence': confidence,
+                    'location': location
                 }
                 
+            self._visual_cache[cache_key] = results
+            if len(self._visual_cache) > VISUAL_CACHE_SIZE:
+                self._visual_cache.popitem(last=False)
             return results
             
         except Exception as e:
             self.logger.error(f"Visual state verification failed: {str(e)}")
             return None
 
+    def _visual_patterns(self):
+        """Parsed visual_patterns.json, re-read only after the file changes"""
+        patterns_file = os.path.join(self.knowledge_dir, 'patterns', 'visual_patterns.json')
+        return _load_json_file(patterns_file, os.stat(patterns_file).st_mtime_ns)
+
     def _load_expected_patterns(self, goal):
         """Load expected visual patterns for goal verification"""
         try:
-            patterns_file = os.path.join(self.knowledge_dir, 'patterns', 'visual_patterns.json')
-            if os.path.exists(patterns_file):
-                with open(patterns_file, 'r') as f:
-                    all_patterns = json.load(f)
+            try:
+                all_patterns = self._visual_patterns()
+            except FileNotFoundError:
+                return {}
+                
+            # Find patterns matching the goal
+            goal_lower = goal.lower()
+            goal_patterns = {}
+            for pattern_name, pattern_data in all_patterns.items():
+                if any(keyword in goal_lower for keyword in pattern_data.get('keywords', [])):
+                    goal_patterns[pattern_name] = pattern_data
                     
-                # Find patterns matching the goal
-                goal_patterns = {}
-                for pattern_name, pattern_data in all_patterns.items():
-                    if any(keyword in goal.lower() for keyword in pattern_data.get('keywords', [])):
-                        goal_patterns[pattern_name] = pattern_data
-                        
-                return goal_patterns
-            return {}
+            return goal_patterns
             
         except Exception as e:
             self.logger.error(f"Failed to load patterns: {str(e)}")
@@ -247,7 +369,7 @@ class GoalVerifier:
             
             for key, expected_value in expected_state.items():
                 current_value = current_state.get(key)
-                self.logger.debug(f"Checking state - {key}: current={current_value}, expected={expected_value}")
+                self.logger.debug("Checking state - %s: current=%s, expected=%s", key, current_value, expected_value)
                 
                 if expected_value is None:
                     continue
@@ -270,15 +392,8 @@ class GoalVerifier:
                     window_titles = current_state.get("window_titles", [])
                     processes = current_state.get("processes", [])
                     
-                    window_match = any(
-                        any(pattern.lower() in title.lower() for pattern in window_patterns)
-                        for title in window_titles
-                    )
-                    
-                    process_match = any(
-                        any(name.lower() in proc.lower() for name in process_names)
-                        for proc in processes
-                    )
+                    window_match = any(_matches_any(window_patterns, title) for title in window_titles)
+                    process_match = any(_matches_any(process_names, proc) for proc in processes)
                     
                     requirement_met = window_match or process_match
                     
@@ -292,7 +407,7 @@ class GoalVerifier:
                     requirement_met = current_value == expected_value
                     
                 if not requirement_met:
-                    self.logger.debug(f"Requirement not met - {key}: expected={expected_value}")
+                    self.logger.debug("Requirement not met - %s: expected=%s", key, expected_value)
                     all_requirements_met = False
                     
             return all_requirements_met
@@ -301,18 +416,18 @@ class GoalVerifier:
             self.logger.error(f"State verification failed: {str(e)}")
             return False
 
-    def _detect_canvas_area(self, screen_state):
-        """Detect the Paint canvas area"""
+    def _detect_canvas_area(self, screen_state, gray=None):
+        """Detect the Paint canvas area as an (x, y, w, h) bounding box"""
         try:
-            gray = cv2.cvtColor(screen_state, cv2.COLOR_BGR2GRAY)
+            if gray is None:
+                gray = cv2.cvtColor(screen_state, cv2.COLOR_BGR2GRAY)
             edges = cv2.Canny(gray, 50, 150)
             contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
             
             if contours:
                 # Find largest rectangular contour
                 canvas = max(contours, key=cv2.contourArea)
-                x, y, w, h = cv2.boundingRect(canvas)
-                return (slice(y, y+h), slice(x, x+w))
+                return cv2.boundingRect(canvas)
             return None
             
         except Exception as e:
@@ -322,10 +437,6 @@ class GoalVerifier:
     def _verify_program_window(self, program_info):
         """Verify and position any program window"""
         try:
-            import win32gui
-            import win32con
-            import win32api
-            
             # Get program info from LLM if not provided
             if isinstance(program_info, str):
                 program_info = self._get_program_info(program_info)
@@ -334,10 +445,13 @@ class GoalVerifier:
             process_names = program_info.get('process_names', [])
             
             # Find program window
+            matcher = _title_matcher(tuple(window_patterns))
+            if matcher is None:
+                return False
+                
             def find_program_window(hwnd, ctx):
                 if win32gui.IsWindowVisible(hwnd):
-                    title = win32gui.GetWindowText(hwnd).lower()
-                    if any(pattern.lower() in title for pattern in window_patterns):
+                    if matcher.search(win32gui.GetWindowText(hwnd)):
                         ctx.append(hwnd)
                 return True
                 
@@ -347,17 +461,7 @@ class GoalVerifier:
             if program_windows:
                 hwnd = program_windows[0]
                 
-                # Get screen dimensions
-                screen_width = win32api.GetSystemMetrics(win32con.SM_CXSCREEN)
-                screen_height = win32api.GetSystemMetrics(win32con.SM_CYSCREEN)
-                
-                # Calculate 90% size
-                window_width = int(screen_width * 0.9)
-                window_height = int(screen_height * 0.9)
-                
-                # Center position
-                x = (screen_width - window_width) // 2
-                y = (screen_height - window_height) // 2
+                x, y, window_width, window_height = self._program_window_rect
                 
                 # Position window
                 win32gui.ShowWindow(hwnd, win32con.SW_NORMAL)
@@ -441,10 +545,6 @@ class GoalVerifier:
     def _get_current_state(self):
         """Get current system state"""
         try:
-            import win32gui
-            import win32process
-            import psutil
-            
             # Get foreground window info
             hwnd = win32gui.GetForegroundWindow()
             window_title = win32gui.GetWindowText(hwnd)
@@ -453,52 +553,48 @@ class GoalVerifier:
             window_titles = []
             paint_hwnd = None
             
+            paint_matcher = _title_matcher(PAINT_TITLE_PATTERNS)
+            
             def enum_callback(hwnd, results):
                 if win32gui.IsWindowVisible(hwnd):
                     title = win32gui.GetWindowText(hwnd)
                     if title:
                         results.append(title)
-                        if any(paint_title in title.lower() for paint_title in ["paint", "untitled", "microsoft paint"]):
+                        if paint_matcher.search(title):
                             nonlocal paint_hwnd
                             paint_hwnd = hwnd
                 return True
                 
             win32gui.EnumWindows(enum_callback, window_titles)
-            self.logger.debug(f"Active windows: {window_titles}")
+            self.logger.debug("Active windows: %s", window_titles)
             
             # Position Paint window if found
             if paint_hwnd:
                 self._verify_program_window("paint")
             
-            state = {
+            return {
                 "active_window": window_title,
                 "window_titles": window_titles,
                 "timestamp": datetime.now().timestamp(),
-                "cursor_position": pyautogui.position()
+                "cursor_position": win32api.GetCursorPos()
             }
             
-            # Check if Paint is running
-            paint_found = False
-            for proc in psutil.process_iter(['name', 'pid']):
-                try:
-                    if proc.name().lower() in ['mspaint.exe']:
-                        paint_found = True
-                        break
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-                    
-            state["paint_open"] = paint_found
-            
-            return state
-            
         except Exception as e:
             self.logger.error(f"Failed to get current state: {str(e)}")
             return {}
 
+    def _is_paint_running(self):
+        """Check if Paint is running"""
+        try:
+            return 'mspaint.exe' in process_utils.running_processes()
+            
+        except Exception as e:
+            self.logger.error(f"Failed to scan processes: {str(e)}")
+            return False
+
     def _enum_windows(self):
         """Enumerate all windows"""
         try:
-            import win32gui
             def callback(hwnd, hwnds):
                 if win32gui.IsWindowVisible(hwnd):
                     hwnds.append(hwnd)
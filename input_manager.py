@@ -6,6 +6,7 @@ import win32con
 import win32api
 import os
 from typing import Optional, Tuple, Dict
+import win_input
 
 class InputManager:
     def __init__(self, logger):
@@ -18,6 +19,8 @@ class InputManager:
         self.verification_delay = 0.5
         self.max_retries = 3
         self.retry_delay = 1.0
+        self.window_timeout = 2.0  # Upper bound on waiting for an expected window
+        self.poll_interval = 0.05
         self.action_history = []
         self.failed_actions = []
         
@@ -62,8 +65,7 @@ class InputManager:
                     
                     # Method 1: pyautogui hotkey
                     try:
-                        pyautogui.hotkey(*key_parts)
-                        time.sleep(1.0)
+                        pyautogui.hotkey(*key_parts, _pause=False)
                         if self._verify_keys_released(key_parts):
                             action_data["success"] = True
                             self.action_history.append(action_data)
@@ -122,29 +124,20 @@ class InputManager:
             # Try multiple methods in sequence
             methods = [
                 # Method 1: pyautogui hotkey
-                lambda: (pyautogui.hotkey('win', 'r'), time.sleep(1.0)),
+                lambda: pyautogui.hotkey('win', 'r', _pause=False),
                 
-                # Method 2: keyboard direct
-                lambda: (keyboard.press('windows'), 
-                        time.sleep(0.2),
-                        keyboard.press('r'),
-                        time.sleep(0.2),
-                        keyboard.release('r'),
-                        time.sleep(0.1),
-                        keyboard.release('windows'),
-                        time.sleep(1.0)),
+                # Method 2: direct SendInput, one prebuilt batch that Windows delivers in order
+                lambda: win_input.send_hotkey(('win', 'r')),
                 
                 # Method 3: Shell command
-                lambda: (os.system('rundll32.exe shell32.dll,#61'),
-                        time.sleep(1.0)),
+                lambda: os.system('rundll32.exe shell32.dll,#61'),
                         
                 # Method 4: Alternative key sequence
                 lambda: (keyboard.press_and_release('windows'),
                         time.sleep(0.5),
                         keyboard.write('run'),
                         time.sleep(0.2),
-                        keyboard.press_and_release('enter'),
-                        time.sleep(1.0))
+                        keyboard.press_and_release('enter'))
             ]
             
             for method in methods:
@@ -155,11 +148,9 @@ class InputManager:
                     # Try method
                     method()
                     
-                    # Verify Run dialog is open
-                    for _ in range(5):  # Check multiple times
-                        if self._verify_window_title('Run'):
-                            return True
-                        time.sleep(0.2)
+                    # Return as soon as the Run dialog takes focus
+                    if self._wait_until(lambda: self._verify_window_title('Run'), self.window_timeout):
+                        return True
                         
                 except Exception as e:
                     self.logger.error(f"Method failed: {str(e)}")
@@ -171,6 +162,16 @@ class InputManager:
             self.logger.error(f"Run dialog failed: {str(e)}")
             return False
             
+    def _wait_until(self, predicate, timeout: float, interval: float = None) -> bool:
+        """Poll predicate until it holds or timeout seconds pass"""
+        interval = self.poll_interval if interval is None else interval
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
+        return True
+            
     def _verify_window_title(self, expected_title: str) -> bool:
         """Verify active window title"""
         try:
@@ -207,10 +208,10 @@ class InputManager:
                     
                     # Method 1: pyautogui typewrite
                     try:
-                        pyautogui.typewrite(text, interval=0.1)
+                        pyautogui.typewrite(text, interval=0.1, _pause=False)
                         time.sleep(0.5)
                         if press_enter:
-                            pyautogui.press('enter')
+                            pyautogui.press('enter', _pause=False)
                             time.sleep(1.0)  # Wait longer after Enter
                         action_data["success"] = True
                         self.action_history.append(action_data)
@@ -258,11 +259,8 @@ class InputManager:
     def _verify_keys_released(self, keys: list) -> bool:
         """Verify all keys are released"""
         try:
-            time.sleep(0.2)  # Wait for key events
-            for key in keys:
-                if keyboard.is_pressed(key):
-                    return False
-            return True
+            return self._wait_until(lambda: not any(keyboard.is_pressed(key) for key in keys),
+                                    self.key_hold_time)
         except:
             return False 
 
@@ -1,5 +1,6 @@
 from typing import Dict, Any, Tuple, Optional
 import json
+import sys
 import requests
 import base64
 from PIL import Image
@@ -9,6 +10,84 @@ from io import BytesIO
 import traceback
 import ollama
 
+# Static prompt bodies, built once at import and filled with str.format per call
+_PLAN_JSON_EXAMPLE = json.dumps({
+    "reasoning": "Your step-by-step thought process",
+    "required_programs": ["list", "of", "needed", "programs"],
+    "next_action": {
+        "action": "action_name",
+        "params": {"param1": "value1"}
+    }
+}, indent=4)
+
+_ANALYZE_AND_PLAN_PROMPT = """You are an AI agent that controls a computer to accomplish tasks.
+Current goal: "{goal}"
+
+Latest screen analysis:
+{vision}
+
+Available actions:
+- focus_window(title): Focus a window with given title
+- launch_program(name): Launch a program by name
+- type_text(text): Type text
+- press_key(key): Press a keyboard key
+- click_element(element): Click on a UI element
+- move_mouse(x, y): Move mouse to coordinates
+
+Think through this step by step:
+1. What program(s) do you need for this task?
+2. Are those programs open (visible in the screen analysis)?
+3. If not, you need to launch them first
+4. What action will make the most progress toward the goal?
+
+Return a JSON response with:
+{example}"""
+
+_PLAN_ACTION_PROMPT = """You are an AI agent controlling a computer to achieve a goal.
+Current goal: {goal}
+
+Current screen state:
+{vision}
+
+Think through this step by step:
+1. What is the current state? (What windows/UI elements are visible?)
+2. What information do you need to progress toward the goal?
+3. What UI elements would help you get that information?
+4. What SINGLE action gets you closer to the goal?
+
+Remember:
+- Focus on visible, interactive elements
+- Use coordinates from the vision analysis
+- If needed information isn't visible, navigate menus/UI to find it
+- Take one action at a time, verify results
+
+Available actions:
+1. click (x: int, y: int) - Click at coordinates
+2. type (text: str) - Type text
+3. press (key: str) - Press a keyboard key (e.g., "win+r" for Run)
+4. move (x: int, y: int) - Move mouse
+5. drag (start_x: int, start_y: int, end_x: int, end_y: int) - Drag mouse
+6. wait (seconds: int) - Wait
+7. focus_window (title: str) - Focus window
+8. launch_program (name: str) - Launch program if needed
+9. stop - Stop if goal complete
+
+Respond with ONLY the action in this format:
+<action_name>
+param1: value1
+param2: value2
+
+Example responses:
+click
+x: 45
+y: 12
+
+focus_window
+title: Browser
+
+press
+key: win+r"""
+
 class LLMInterface:
     """Handles all LLM interactions with Ollama's Llama 3.2 Vision API"""
     
@@ -19,6 +98,7 @@ class LLMInterface:
         self.api_url = "http://localhost:11434/api/generate"
         self.model = "llama3.2-vision"
         self.client = ollama.Client(host='http://localhost:11434')  # Initialize client
+        self.session = requests.Session()  # Keep-alive connection reused across planning calls
 
     def get_next_action(self, goal: str, state: Dict[str, Any], vision_info: Dict[str, Any]) -> Dict[str, Any]:
         """Get next action based on current state and vision info"""
@@ -63,7 +143,7 @@ Your response:"""
 
             self.logger.debug(f"Sending prompt to LLM...")
             
-            response = requests.post(
+            response = self.session.post(
                 self.api_url,
                 json={
                     "model": self.model,
@@ -75,14 +155,14 @@ Your response:"""
             
             result = response.json()
             response_text = result.get("response", "").strip()
-            self.logger.debug(f"Raw LLM response: {response_text}")
+            self.logger.debug("Raw LLM response: %s", response_text)
             
             if not response_text:
                 self.logger.error("Empty response from LLM")
                 return {"function_name": "stop", "error": "Empty response from LLM"}
                 
             action = self._parse_action(response_text)
-            self.logger.debug(f"Parsed action: {action}")
+            self.logger.debug("Parsed action: %s", action)
             
             # Add to conversation history
             self.conversation_history.append({
@@ -103,8 +183,8 @@ Your response:"""
             if not lines:
                 return {"error": "Empty action text"}
             
-            # First line is the function name
-            function_name = lines[0].strip().lower()
+            # First line is the function name; interned so the executor's dispatch lookup compares by identity
+            function_name = sys.intern(lines[0].strip().lower())
             
             # Parse parameters
             parameters = {}
@@ -123,7 +203,7 @@ Your response:"""
                         pass
                     parameters[key] = value
                     
-            self.logger.debug(f"Parsed action: {function_name} with params: {parameters}")
+            self.logger.debug("Parsed action: %s with params: %s", function_name, parameters)
             
             return {
                 "function_name": function_name,
@@ -145,6 +225,7 @@ Your response:"""
     def cleanup(self):
         """Clean up resources"""
         self.conversation_history.clear()
+        self.session.close()
 
     def _format_prompt(self, context: Dict[str, Any]) -> str:
         """Format context into prompt for LLM"""
@@ -200,35 +281,7 @@ Your response:
     def analyze_and_plan(self, vision_output: str, goal: str) -> Dict[str, Any]:
         """Analyze vision output and plan next action"""
         try:
-            prompt = f"""You are an AI agent that controls a computer to accomplish tasks.
-Current goal: "{goal}"
-
-Latest screen analysis:
-{vision_output}
-
-Available actions:
-- focus_window(title): Focus a window with given title
-- launch_program(name): Launch a program by name
-- type_text(text): Type text
-- press_key(key): Press a keyboard key
-- click_element(element): Click on a UI element
-- move_mouse(x, y): Move mouse to coordinates
-
-Think through this step by step:
-1. What program(s) do you need for this task?
-2. Are those programs open (visible in the screen analysis)?
-3. If not, you need to launch them first
-4. What action will make the most progress toward the goal?
-
-Return a JSON response with:
-{
-    "reasoning": "Your step-by-step thought process",
-    "required_programs": ["list", "of", "needed", "programs"],
-    "next_action": {
-        "action": "action_name",
-        "params": {"param1": "value1"}
-    }
-}"""
+            prompt = _ANALYZE_AND_PLAN_PROMPT.format(goal=goal, vision=vision_output, example=_PLAN_JSON_EXAMPLE)
 
             response = self.client.chat.completions.create(
                 model=self.model,
@@ -238,7 +291,7 @@ Return a JSON response with:
             # Parse response
             try:
                 result = json.loads(response.choices[0].message.content)
-                self.logger.debug(f"Planning result: {result}")
+                self.logger.debug("Planning result: %s", result)
                 return result
             except json.JSONDecodeError:
                 self.logger.error("Failed to parse LLM response as JSON")
@@ -251,55 +304,12 @@ Return a JSON response with:
     def plan_action(self, goal: str, vision_description: str) -> Dict[str, Any]:
         """Plan next action based on goal and current screen state"""
         try:
-            prompt = f"""You are an AI agent controlling a computer to achieve a goal.
-Current goal: {goal}
-
-Current screen state:
-{vision_description}
-
-Think through this step by step:
-1. What is the current state? (What windows/UI elements are visible?)
-2. What information do you need to progress toward the goal?
-3. What UI elements would help you get that information?
-4. What SINGLE action gets you closer to the goal?
-
-Remember:
-- Focus on visible, interactive elements
-- Use coordinates from the vision analysis
-- If needed information isn't visible, navigate menus/UI to find it
-- Take one action at a time, verify results
-
-Available actions:
-1. click (x: int, y: int) - Click at coordinates
-2. type (text: str) - Type text
-3. press (key: str) - Press a keyboard key (e.g., "win+r" for Run)
-4. move (x: int, y: int) - Move mouse
-5. drag (start_x: int, start_y: int, end_x: int, end_y: int) - Drag mouse
-6. wait (seconds: int) - Wait
-7. focus_window (title: str) - Focus window
-8. launch_program (name: str) - Launch program if needed
-9. stop - Stop if goal complete
-
-Respond with ONLY the action in this format:
-<action_name>
-param1: value1
-param2: value2
-
-Example responses:
-click
-x: 45
-y: 12
-
-focus_window
-title: Browser
-
-press
-key: win+r"""
+            prompt = _PLAN_ACTION_PROMPT.format(goal=goal, vision=vision_description)
 
             self.logger.debug(f"Planning next action for goal: {goal}")
             self.logger.debug(f"Current vision state:\n{vision_description}")
             
-            response = requests.post(
+            response = self.session.post(
                 self.api_url,
                 json={
                     "model": self.model,
@@ -318,9 +328,9 @@ key: win+r"""
                 self.logger.error("Empty response from LLM")
                 return {"error": "Empty response from LLM"}
             
-            self.logger.debug(f"Raw action response:\n{action_text}")
+            self.logger.debug("Raw action response:\n%s", action_text)
             action = self._parse_action(action_text)
-            self.logger.debug(f"Parsed action: {action}")
+            self.logger.debug("Parsed action: %s", action)
             
             # Add to conversation history
             self.conversation_history.append({
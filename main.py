@@ -66,7 +66,8 @@ class AgentGUI:
             "model": "llama3.2-vision",
             "api_url": "http://localhost:11434",
             "vision_timeout": 30,
-            "test_timeout": 10
+            "test_timeout": 10,
+            "vision_hedge_hosts": []  # Additional Ollama hosts to race vision requests against
         }
         
         # Initialize components
@@ -0,0 +1,86 @@
+"""
+Fast running-process lookup shared by the executor and verifiers
+"""
+import ctypes
+import sys
+import time
+from ctypes import wintypes
+from typing import Dict
+
+import psutil
+
+PROCESS_CACHE_TTL = 0.5  # Seconds a snapshot is reused before re-enumerating
+
+TH32CS_SNAPPROCESS = 0x00000002
+MAX_PATH = 260
+
+_cache_time = 0.0
+_cache: Dict[str, int] = {}
+
+
+class PROCESSENTRY32W(ctypes.Structure):
+    _fields_ = [
+        ("dwSize", wintypes.DWORD),
+        ("cntUsage", wintypes.DWORD),
+        ("th32ProcessID", wintypes.DWORD),
+        ("th32DefaultHeapID", ctypes.c_size_t),
+        ("th32ModuleID", wintypes.DWORD),
+        ("cntThreads", wintypes.DWORD),
+        ("th32ParentProcessID", wintypes.DWORD),
+        ("pcPriClassBase", wintypes.LONG),
+        ("dwFlags", wintypes.DWORD),
+        ("szExeFile", wintypes.WCHAR * MAX_PATH),
+    ]
+
+
+if sys.platform == "win32":
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _kernel32.CreateToolhelp32Snapshot.argtypes = (wintypes.DWORD, wintypes.DWORD)
+    _kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    _kernel32.Process32FirstW.argtypes = (wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W))
+    _kernel32.Process32FirstW.restype = wintypes.BOOL
+    _kernel32.Process32NextW.argtypes = (wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W))
+    _kernel32.Process32NextW.restype = wintypes.BOOL
+    _kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+    _kernel32.CloseHandle.restype = wintypes.BOOL
+    _INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+else:
+    _kernel32 = None
+
+
+def _snapshot_toolhelp() -> Dict[str, int]:
+    """Enumerate processes with a single CreateToolhelp32Snapshot"""
+    snapshot = _kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+    if snapshot == _INVALID_HANDLE_VALUE:
+        raise ctypes.WinError(ctypes.get_last_error())
+
+    processes = {}
+    try:
+        entry = PROCESSENTRY32W()
+        entry.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+        more = _kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+        while more:
+            processes[entry.szExeFile.lower()] = entry.th32ProcessID
+            more = _kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+    finally:
+        _kernel32.CloseHandle(snapshot)
+    return processes
+
+
+def _snapshot_psutil() -> Dict[str, int]:
+    processes = {}
+    for proc in psutil.process_iter(['name']):
+        name = proc.info['name']
+        if name:
+            processes[name.lower()] = proc.pid
+    return processes
+
+
+def running_processes(max_age: float = PROCESS_CACHE_TTL) -> Dict[str, int]:
+    """Return {lowercase executable name: pid}, reusing a snapshot younger than max_age"""
+    global _cache_time, _cache
+    now = time.monotonic()
+    if now - _cache_time >= max_age:
+        _cache = _snapshot_toolhelp() if _kernel32 else _snapshot_psutil()
+        _cache_time = now
+    return _cache
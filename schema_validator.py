@@ -1,14 +1,23 @@
 import json
 
+def _missing_field(required: frozenset, data):
+    """Return a required field absent from data, or None if all are present"""
+    if not isinstance(data, dict):
+        # A non-object has none of the fields; report the first like a dict missing them all
+        return min(required)
+    if data.keys() >= required:
+        return None
+    return next(field for field in sorted(required) if field not in data)
+
 class SchemaValidator:
     SCHEMAS = {
         'goal_breakdown': {
-            'required_fields': ['steps'],
-            'steps_required_fields': ['name', 'description', 'verification']
+            'required_fields': frozenset(['steps']),
+            'steps_required_fields': frozenset(['name', 'description', 'verification'])
         },
         'state_check': {
-            'required_fields': ['required_states'],
-            'state_required_fields': ['type', 'value']
+            'required_fields': frozenset(['required_states']),
+            'state_required_fields': frozenset(['type', 'value'])
         }
     }
     
@@ -24,9 +33,9 @@ class SchemaValidator:
             schema = cls.SCHEMAS[response_type]
             
             # Check required top-level fields
-            for field in schema['required_fields']:
-                if field not in data:
-                    return False, f"Missing required field: {field}"
+            missing = _missing_field(schema['required_fields'], data)
+            if missing:
+                return False, f"Missing required field: {missing}"
             
             # Check steps structure for goal_breakdown
             if response_type == 'goal_breakdown':
@@ -34,9 +43,9 @@ class SchemaValidator:
                     return False, "Steps must be a list"
                     
                 for step in data['steps']:
-                    for field in schema['steps_required_fields']:
-                        if field not in step:
-                            return False, f"Step missing required field: {field}"
+                    missing = _missing_field(schema['steps_required_fields'], step)
+                    if missing:
+                        return False, f"Step missing required field: {missing}"
             
             # Check states structure for state_check
             elif response_type == 'state_check':
@@ -44,9 +53,9 @@ class SchemaValidator:
                     return False, "Required states must be a list"
                     
                 for state in data['required_states']:
-                    for field in schema['state_required_fields']:
-                        if field not in state:
-                            return False, f"State missing required field: {field}"
+                    missing = _missing_field(schema['state_required_fields'], state)
+                    if missing:
+                        return False, f"State missing required field: {missing}"
             
             return True, None
             
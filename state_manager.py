@@ -19,6 +19,12 @@ class SystemState:
     vision_info: dict = None
     last_action: dict = None
     last_result: dict = None
+
+class _WindowFound(Exception):
+    """Raised from an EnumWindows callback to stop enumeration at the first match"""
+    def __init__(self, hwnd):
+        super().__init__(hwnd)
+        self.hwnd = hwnd
     
 class StateManager:
     def __init__(self, logger=None):
@@ -70,17 +76,9 @@ class StateManager:
 
     def close_program(self, program_name: str) -> bool:
         """Close specified program"""
-        def find_window(hwnd, ctx):
-            if win32gui.IsWindowVisible(hwnd):
-                title = win32gui.GetWindowText(hwnd)
-                if program_name.lower() in title.lower():
-                    ctx.append(hwnd)
-        
-        handles = []
-        win32gui.EnumWindows(find_window, handles)
-        
-        if handles:
-            win32gui.PostMessage(handles[0], win32con.WM_CLOSE, 0, 0)
+        hwnd = self._find_window(program_name)
+        if hwnd:
+            win32gui.PostMessage(hwnd, win32con.WM_CLOSE, 0, 0)
             return True
         return False 
 
@@ -111,11 +109,35 @@ class StateManager:
 
     def get_window_by_title(self, title: str) -> dict:
         """Find window by title (partial match)"""
-        for window in self._get_window_list():
-            if title.lower() in window['title'].lower():
-                return window
+        hwnd = self._find_window(title)
+        if hwnd:
+            return {
+                'handle': hwnd,
+                'title': win32gui.GetWindowText(hwnd),
+                'rect': win32gui.GetWindowRect(hwnd)
+            }
         return None
 
+    def _find_window(self, title: str) -> int:
+        """Return the first visible window whose title contains title, or 0"""
+        # Exact titles resolve with a single FindWindow call
+        try:
+            hwnd = win32gui.FindWindow(None, title)
+        except win32gui.error:
+            hwnd = 0
+        if hwnd and win32gui.IsWindowVisible(hwnd):
+            return hwnd
+
+        def find_window(hwnd, ctx):
+            if win32gui.IsWindowVisible(hwnd) and ctx[0] in win32gui.GetWindowText(hwnd).lower():
+                raise _WindowFound(hwnd)
+
+        try:
+            win32gui.EnumWindows(find_window, (title.lower(),))
+        except _WindowFound as found:
+            return found.hwnd
+        return 0
+
     def get_active_window(self) -> dict:
         """Get currently active window"""
         try:
@@ -146,7 +168,7 @@ class StateManager:
                     self.current_state['timestamp'] = datetime.now().isoformat()
                     
                 # Log state update
-                self.logger.debug(f"State updated: {new_state}")
+                self.logger.debug("State updated: %s", new_state)
                 
             else:
                 # Handle case where current_state is not a dict
@@ -0,0 +1,84 @@
+"""
+Cached template loading and pyramid template matching shared by the executor and verifiers
+"""
+import functools
+import os
+from typing import Tuple
+
+PYRAMID_LEVELS = 2  # Coarse search runs at 1/4 resolution
+PYRAMID_SCALE = 2 ** PYRAMID_LEVELS
+MIN_COARSE_TEMPLATE_SIZE = 8
+
+
+def pyramid_down(image):
+    import cv2
+    for _ in range(PYRAMID_LEVELS):
+        image = cv2.pyrDown(image)
+    return image
+
+
+@functools.lru_cache(maxsize=128)
+def _decode_template(path: str, mtime: float):
+    """Decode a grayscale template and its coarse pyramid level once; mtime in the key invalidates edited files"""
+    import cv2
+    template = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+    if template is None:
+        raise ValueError(f"Could not read template image: {path}")
+    return template, pyramid_down(template)
+
+
+def load_template(path: str):
+    """Return (grayscale template, coarse pyramid level), decoding the file only when it changes"""
+    return _decode_template(path, os.path.getmtime(path))
+
+
+def match_template(screen_gray, template, coarse_template, method: int = None,
+                   coarse_screen=None, accept: float = None,
+                   reject: float = None) -> Tuple[float, Tuple[int, int]]:
+    """Find template on a grayscale screen, searching a coarse pyramid level first.
+
+    Defaults to TM_SQDIFF_NORMED, which skips the mean/variance normalisation of
+    TM_CCOEFF_NORMED; callers with thresholds tuned for another method can pass it.
+    Returns (confidence, top-left location) of the best match at full resolution,
+    with confidence = 1 - normalised squared difference for the SQDIFF methods.
+    Callers matching several templates against one frame can pass coarse_screen
+    (pyramid_down(screen_gray)) so the screen is downsampled only once. Callers that
+    only need to know whether the template is present can pass accept: a coarse match
+    already at or above it is returned without the full-resolution refinement, with
+    the location scaled up from the coarse level. Likewise a coarse match below reject
+    is returned unrefined, for callers that treat it as absent anyway.
+    """
+    import cv2
+    if method is None:
+        method = cv2.TM_SQDIFF_NORMED
+    sqdiff = method in (cv2.TM_SQDIFF, cv2.TM_SQDIFF_NORMED)
+
+    def best_match(result):
+        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+        return (1.0 - float(min_val), min_loc) if sqdiff else (float(max_val), max_loc)
+
+    offset_x, offset_y = 0, 0
+    search_area = screen_gray
+    template_h, template_w = template.shape[:2]
+
+    if min(coarse_template.shape[:2]) >= MIN_COARSE_TEMPLATE_SIZE:
+        if coarse_screen is None:
+            coarse_screen = pyramid_down(screen_gray)
+        coarse_confidence, (coarse_x, coarse_y) = best_match(cv2.matchTemplate(coarse_screen, coarse_template, method))
+        if ((accept is not None and coarse_confidence >= accept) or
+                (reject is not None and coarse_confidence < reject)):
+            return coarse_confidence, (coarse_x * PYRAMID_SCALE, coarse_y * PYRAMID_SCALE)
+
+        # Refine at full resolution in a small window around the coarse hit
+        pad = PYRAMID_SCALE * 2
+        screen_h, screen_w = screen_gray.shape[:2]
+        x0 = max(coarse_x * PYRAMID_SCALE - pad, 0)
+        y0 = max(coarse_y * PYRAMID_SCALE - pad, 0)
+        x1 = min(coarse_x * PYRAMID_SCALE + template_w + pad, screen_w)
+        y1 = min(coarse_y * PYRAMID_SCALE + template_h + pad, screen_h)
+        if x1 - x0 >= template_w and y1 - y0 >= template_h:
+            search_area = screen_gray[y0:y1, x0:x1]
+            offset_x, offset_y = x0, y0
+
+    confidence, (x, y) = best_match(cv2.matchTemplate(search_area, template, method))
+    return confidence, (offset_x + x, offset_y + y)
@@ -8,7 +8,15 @@ import traceback
 import time
 import ollama  # Add ollama library
 import io
-from PIL import ImageGrab
+import threading
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import cv2
+import numpy as np
+import mss
+
+VISION_CACHE_SIZE = 64  # Recent frame hash -> vision analysis results kept
 
 class VisionProcessor:
     def __init__(self, config: Dict[str, Any], logger: logging.Logger):
@@ -16,9 +24,15 @@ class VisionProcessor:
         self.logger = logger
         self.model = "llama3.2-vision"  # Always use this model
         self.client = ollama.Client(host='http://localhost:11434')
+        # Extra Ollama hosts raced against the main one; the first good response wins
+        self.hedge_clients = [ollama.Client(host=host) for host in config.get('vision_hedge_hosts', [])]
+        self._hedge_pool = ThreadPoolExecutor(max_workers=len(self.hedge_clients) + 1) if self.hedge_clients else None
         self.is_test_mode = False  # Flag to control validation behavior
         self.last_screenshot = None
         self.last_screenshot_time = 0
+        self._local = threading.local()  # per-thread mss grabber; capture may run on a worker thread
+        self._vision_cache = OrderedDict()
+        self._vision_cache_lock = threading.Lock()
         
     def _check_model(self) -> bool:
         """Check if vision model is available"""
@@ -98,22 +112,62 @@ class VisionProcessor:
             self.logger.error(f"Model response test failed: {str(e)}")
             return False
 
-    def analyze_screen(self, screenshot: Image.Image, is_test: bool = False, test_string: str = None) -> Dict[str, Any]:
-        """Analyze screenshot with vision model"""
+    def _chat(self, messages):
+        """Send a chat request, hedged across the configured Ollama hosts when there are any"""
+        if not self.hedge_clients:
+            return self.client.chat(model=self.model, messages=messages)
+            
+        pending = {self._hedge_pool.submit(client.chat, model=self.model, messages=messages)
+                   for client in [self.client] + self.hedge_clients}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # Requests already in flight cannot be aborted; their responses are dropped
+                    for loser in pending:
+                        loser.cancel()
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def _to_bgr(self, frame: np.ndarray) -> np.ndarray:
+        """Drop the alpha channel into a per-thread buffer reused across frames of the same size"""
+        if frame.shape[2] == 3:
+            return frame
+        buf = getattr(self._local, 'bgr', None)
+        if buf is None or buf.shape[:2] != frame.shape[:2]:
+            buf = self._local.bgr = np.empty((frame.shape[0], frame.shape[1], 3), dtype=np.uint8)
+        return cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR, dst=buf)
+
+    def analyze_screen(self, screenshot, is_test: bool = False, test_string: str = None) -> Dict[str, Any]:
+        """Analyze a screenshot (PIL Image or BGR/BGRA numpy frame) with vision model"""
+        screen_size = None
         try:
-            # Verify screenshot is an Image
-            if not isinstance(screenshot, Image.Image):
-                raise ValueError("Screenshot must be a PIL Image object")
+            if isinstance(screenshot, np.ndarray):
+                # Encode the captured frame directly, without building a PIL image
+                screen_size = (screenshot.shape[1], screenshot.shape[0])
+                frame = self._to_bgr(screenshot)
+                ok, jpeg = cv2.imencode('.jpg', frame)
+                if not ok:
+                    raise ValueError("Failed to encode screenshot")
+                jpeg_bytes = jpeg.tobytes()
+            elif isinstance(screenshot, Image.Image):
+                screen_size = screenshot.size
+                img_byte_arr = io.BytesIO()
+                screenshot.save(img_byte_arr, format='JPEG')
+                jpeg_bytes = img_byte_arr.getvalue()
+            else:
+                raise ValueError("Screenshot must be a PIL Image or numpy array")
             
             # Convert screenshot to base64
-            img_byte_arr = io.BytesIO()
-            screenshot.save(img_byte_arr, format='JPEG')
-            img_str = base64.b64encode(img_byte_arr.getvalue()).decode('utf-8')
+            img_str = base64.b64encode(jpeg_bytes).decode('utf-8')
             
             # Save debug screenshot only during testing
             if is_test:
                 debug_file = "debug_vision_test.jpg"
-                screenshot.save(debug_file)
+                with open(debug_file, 'wb') as f:
+                    f.write(jpeg_bytes)
                 self.logger.info(f"Saved debug screenshot to {debug_file}")
                 
                 # Model verification only during testing
@@ -153,14 +207,11 @@ Format:
 
 Be precise and only list what is actually visible and interactive.'''
 
-                response = self.client.chat(
-                    model=self.model,
-                    messages=[{
-                        'role': 'user',
-                        'content': prompt,
-                        'images': [img_str]
-                    }]
-                )
+                response = self._chat([{
+                    'role': 'user',
+                    'content': prompt,
+                    'images': [img_str]
+                }])
                 
                 elapsed_time = time.time() - start_time
                 self.logger.info(f"Got response in {elapsed_time:.1f} seconds")
@@ -207,7 +258,7 @@ Be precise and only list what is actually visible and interactive.'''
                     "description": description,
                     "timestamp": datetime.now().isoformat(),
                     "success": True,
-                    "screen_size": screenshot.size,
+                    "screen_size": screen_size,
                     "test_results": {
                         "exact_matches": matches,
                         "case_insensitive_matches": near_matches
@@ -227,7 +278,7 @@ Be precise and only list what is actually visible and interactive.'''
                     "error": str(e),
                     "success": False,
                     "timestamp": datetime.now().isoformat(),
-                    "screen_size": screenshot.size
+                    "screen_size": screen_size
                 }
             
         except Exception as e:
@@ -237,7 +288,7 @@ Be precise and only list what is actually visible and interactive.'''
                 "error": str(e),
                 "success": False,
                 "timestamp": datetime.now().isoformat(),
-                "screen_size": screenshot.size if screenshot else None
+                "screen_size": screen_size
             }
 
     def _format_prompt(self, text: str) -> str:
@@ -254,25 +305,46 @@ Be precise and only list what is actually visible and interactive.'''
         Question: {text}
         """ 
 
+    def grab_screen(self) -> np.ndarray:
+        """Grab the primary monitor as a BGRA view over the mss buffer, with no PIL conversion"""
+        sct = getattr(self._local, 'sct', None)
+        if sct is None:
+            # Grabber and monitor rect are set up once per thread and reused for every frame
+            sct = self._local.sct = mss.mss()
+            self._local.monitor = sct.monitors[1]
+        shot = sct.grab(self._local.monitor)
+        return np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+
     def capture_screen(self) -> Dict[str, Any]:
         """Capture screen and analyze with vision model"""
         try:
-            # Take screenshot
-            screenshot = ImageGrab.grab()
+            screenshot = self.grab_screen()
             self.last_screenshot = screenshot
             
+            # An unchanged screen reuses its earlier analysis instead of another model call;
+            # every pixel is hashed so a typed character or a thin stroke changes the key
+            cache_key = hashlib.blake2b(np.ascontiguousarray(screenshot), digest_size=16).digest()
+            with self._vision_cache_lock:
+                cached = self._vision_cache.get(cache_key)
+                if cached is not None:
+                    self._vision_cache.move_to_end(cache_key)
+            if cached is not None:
+                self.logger.debug("Screen unchanged, reusing cached vision analysis")
+                return dict(cached, timestamp=datetime.now().isoformat())
+            
             # Analyze with vision model (no testing)
             start_time = time.time()
             
-            # Verify screenshot is an Image before proceeding
-            if not isinstance(screenshot, Image.Image):
-                raise ValueError("Failed to capture valid screenshot")
-            
             analysis = self.analyze_screen(screenshot, is_test=False)
             
             if not analysis.get("success"):
                 self.logger.error(f"Vision analysis failed: {analysis.get('error')}")
                 return analysis
+                
+            with self._vision_cache_lock:
+                self._vision_cache[cache_key] = analysis
+                if len(self._vision_cache) > VISION_CACHE_SIZE:
+                    self._vision_cache.popitem(last=False)
             
             elapsed = time.time() - start_time
             self.logger.info(f"Got vision response in {elapsed:.1f} seconds")
@@ -2,7 +2,6 @@ import tkinter as tk
 import random
 import string
 import logging
-from PIL import ImageGrab
 import traceback
 import win32gui
 
@@ -107,8 +106,8 @@ class VisionTestWindow:
             self.logger.info(f"Window has focus: {self.window.focus_get() is not None}")
             
             # Capture screenshot
-            screenshot = ImageGrab.grab()
-            self.logger.info(f"Screenshot size: {screenshot.size}")
+            screenshot = self.vision_processor.grab_screen()
+            self.logger.info(f"Screenshot size: {screenshot.shape[1]}x{screenshot.shape[0]}")
             
             # Get vision analysis with test flag and test string
             self.logger.info("Sending to vision processor...")
@@ -0,0 +1,115 @@
+"""
+WinEvent hook that signals when windows on the desktop change.
+
+Instead of sleeping a fixed interval between screenshots, callers can block on
+WindowEventWatcher.wait() and wake as soon as a window moves, is renamed or the
+foreground changes. On non-Windows platforms AVAILABLE is False and callers
+should fall back to a plain sleep.
+"""
+import ctypes
+import sys
+import threading
+from ctypes import wintypes
+
+AVAILABLE = sys.platform == "win32"
+
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_OBJECT_LOCATIONCHANGE = 0x800B
+EVENT_OBJECT_NAMECHANGE = 0x800C
+
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+
+OBJID_WINDOW = 0
+CHILDID_SELF = 0
+
+GA_ROOT = 2
+
+WM_QUIT = 0x0012
+
+# (first event, last event) ranges to hook
+_HOOK_RANGES = (
+    (EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND),
+    (EVENT_OBJECT_LOCATIONCHANGE, EVENT_OBJECT_NAMECHANGE),
+)
+
+if AVAILABLE:
+    WINEVENTPROC = ctypes.WINFUNCTYPE(
+        None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+        wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD,
+    )
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _user32.SetWinEventHook.argtypes = (
+        wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, WINEVENTPROC,
+        wintypes.DWORD, wintypes.DWORD, wintypes.DWORD,
+    )
+    _user32.SetWinEventHook.restype = wintypes.HANDLE
+    _user32.UnhookWinEvent.argtypes = (wintypes.HANDLE,)
+    _user32.UnhookWinEvent.restype = wintypes.BOOL
+    _user32.GetMessageW.argtypes = (ctypes.POINTER(wintypes.MSG), wintypes.HWND, wintypes.UINT, wintypes.UINT)
+    _user32.GetMessageW.restype = wintypes.BOOL
+    _user32.PostThreadMessageW.argtypes = (wintypes.DWORD, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM)
+    _user32.PostThreadMessageW.restype = wintypes.BOOL
+    _kernel32.GetCurrentThreadId.restype = wintypes.DWORD
+    _user32.GetAncestor.argtypes = (wintypes.HWND, wintypes.UINT)
+    _user32.GetAncestor.restype = wintypes.HWND
+
+
+class WindowEventWatcher:
+    """Runs WinEvent hooks on a background message-loop thread and exposes them as a threading.Event"""
+
+    def __init__(self):
+        self._changed = threading.Event()
+        self._thread = None
+        self._thread_id = None
+        self._ready = threading.Event()
+        # Keep a reference so the callback is not garbage collected while hooked
+        self._callback = WINEVENTPROC(self._on_event)
+
+    def _on_event(self, hook, event, hwnd, id_object, id_child, thread_id, event_time):
+        # Only whole top-level windows count; animated controls, progress bars, tooltips,
+        # the caret and the cursor fire LOCATIONCHANGE constantly on a busy desktop
+        if id_object == OBJID_WINDOW and id_child == CHILDID_SELF and hwnd:
+            # Child-window controls report OBJID_WINDOW too; keep only top-level windows
+            if _user32.GetAncestor(hwnd, GA_ROOT) == hwnd:
+                self._changed.set()
+
+    def _run(self):
+        self._thread_id = _kernel32.GetCurrentThreadId()
+        flags = WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS
+        hooks = [_user32.SetWinEventHook(first, last, None, self._callback, 0, 0, flags)
+                 for first, last in _HOOK_RANGES]
+        self._ready.set()
+        try:
+            msg = wintypes.MSG()
+            # Out-of-context hooks are delivered while this thread pumps messages
+            while _user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                pass
+        finally:
+            for hook in hooks:
+                if hook:
+                    _user32.UnhookWinEvent(hook)
+
+    def start(self) -> None:
+        """Install the hooks on a daemon thread"""
+        if self._thread is not None:
+            return
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, name="win-events", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self) -> None:
+        """Remove the hooks and end the message loop"""
+        if self._thread is None:
+            return
+        _user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+        self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def wait(self, timeout: float) -> bool:
+        """Block until a window event arrives or timeout elapses; True if an event arrived"""
+        changed = self._changed.wait(timeout)
+        self._changed.clear()
+        return changed
@@ -0,0 +1,232 @@
+"""
+Direct Win32 SendInput wrappers for low-latency mouse and keyboard input.
+
+pyautogui routes every call through several layers of Python before reaching
+the OS; these helpers build INPUT structs with ctypes and hand them straight to
+user32. On non-Windows platforms AVAILABLE is False and callers should fall back
+to pyautogui.
+"""
+import ctypes
+import functools
+import sys
+from ctypes import wintypes
+
+AVAILABLE = sys.platform == "win32"
+
+INPUT_MOUSE = 0
+INPUT_KEYBOARD = 1
+
+MOUSEEVENTF_MOVE = 0x0001
+MOUSEEVENTF_LEFTDOWN = 0x0002
+MOUSEEVENTF_LEFTUP = 0x0004
+MOUSEEVENTF_RIGHTDOWN = 0x0008
+MOUSEEVENTF_RIGHTUP = 0x0010
+MOUSEEVENTF_MIDDLEDOWN = 0x0020
+MOUSEEVENTF_MIDDLEUP = 0x0040
+MOUSEEVENTF_VIRTUALDESK = 0x4000
+MOUSEEVENTF_ABSOLUTE = 0x8000
+
+SM_XVIRTUALSCREEN = 76
+SM_YVIRTUALSCREEN = 77
+SM_CXVIRTUALSCREEN = 78
+SM_CYVIRTUALSCREEN = 79
+
+_ABSOLUTE_MOVE = MOUSEEVENTF_MOVE | MOUSEEVENTF_ABSOLUTE | MOUSEEVENTF_VIRTUALDESK
+
+KEYEVENTF_EXTENDEDKEY = 0x0001
+KEYEVENTF_KEYUP = 0x0002
+
+MAPVK_VK_TO_VSC = 0
+
+VK_SHIFT = 0x10
+
+# Button name -> (down flag, up flag)
+_BUTTON_FLAGS = {
+    "left": (MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP),
+    "right": (MOUSEEVENTF_RIGHTDOWN, MOUSEEVENTF_RIGHTUP),
+    "middle": (MOUSEEVENTF_MIDDLEDOWN, MOUSEEVENTF_MIDDLEUP),
+    # pyautogui aliases, still used by stored plans
+    "primary": (MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP),
+    "secondary": (MOUSEEVENTF_RIGHTDOWN, MOUSEEVENTF_RIGHTUP),
+}
+
+# Named keys (pyautogui naming) -> virtual-key code
+_VK_NAMES = {
+    "backspace": 0x08, "tab": 0x09, "enter": 0x0D, "return": 0x0D,
+    "shift": 0x10, "ctrl": 0x11, "alt": 0x12, "pause": 0x13,
+    "capslock": 0x14, "esc": 0x1B, "escape": 0x1B, "space": 0x20,
+    "pageup": 0x21, "pagedown": 0x22, "end": 0x23, "home": 0x24,
+    "left": 0x25, "up": 0x26, "right": 0x27, "down": 0x28,
+    "printscreen": 0x2C, "insert": 0x2D, "delete": 0x2E, "del": 0x2E,
+    "win": 0x5B, "winleft": 0x5B, "windows": 0x5B, "winright": 0x5C,
+    "apps": 0x5D,
+}
+_VK_NAMES.update({f"f{i}": 0x6F + i for i in range(1, 13)})
+
+# Keys that need KEYEVENTF_EXTENDEDKEY to be interpreted correctly
+_EXTENDED_VKS = frozenset((0x21, 0x22, 0x23, 0x24, 0x25, 0x26, 0x27, 0x28,
+                           0x2C, 0x2D, 0x2E, 0x5B, 0x5C, 0x5D))
+
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ("dx", wintypes.LONG),
+        ("dy", wintypes.LONG),
+        ("mouseData", wintypes.DWORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ("wVk", wintypes.WORD),
+        ("wScan", wintypes.WORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+
+class HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [
+        ("uMsg", wintypes.DWORD),
+        ("wParamL", wintypes.WORD),
+        ("wParamH", wintypes.WORD),
+    ]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [
+        ("mi", MOUSEINPUT),
+        ("ki", KEYBDINPUT),
+        ("hi", HARDWAREINPUT),
+    ]
+
+
+class INPUT(ctypes.Structure):
+    _anonymous_ = ("u",)
+    _fields_ = [
+        ("type", wintypes.DWORD),
+        ("u", _INPUTUNION),
+    ]
+
+
+if AVAILABLE:
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)
+    _user32.SendInput.argtypes = (wintypes.UINT, ctypes.POINTER(INPUT), ctypes.c_int)
+    _user32.SendInput.restype = wintypes.UINT
+    _user32.MapVirtualKeyW.argtypes = (wintypes.UINT, wintypes.UINT)
+    _user32.MapVirtualKeyW.restype = wintypes.UINT
+    _user32.VkKeyScanW.argtypes = (wintypes.WCHAR,)
+    _user32.VkKeyScanW.restype = ctypes.c_short
+    _user32.SetCursorPos.argtypes = (ctypes.c_int, ctypes.c_int)
+    _user32.SetCursorPos.restype = wintypes.BOOL
+    _user32.GetSystemMetrics.argtypes = (ctypes.c_int,)
+    _user32.GetSystemMetrics.restype = ctypes.c_int
+
+
+def _send(inputs) -> None:
+    """Send a sequence of INPUT structs in a single SendInput call"""
+    _send_array((INPUT * len(inputs))(*inputs))
+
+
+def _send_array(array) -> None:
+    """Send a prebuilt INPUT array in a single SendInput call"""
+    count = len(array)
+    sent = _user32.SendInput(count, array, ctypes.sizeof(INPUT))
+    if sent != count:
+        raise ctypes.WinError(ctypes.get_last_error())
+
+
+def _mouse_input(flags: int, dx: int = 0, dy: int = 0) -> INPUT:
+    return INPUT(type=INPUT_MOUSE, mi=MOUSEINPUT(dx=dx, dy=dy, dwFlags=flags))
+
+
+def _key_input(vk: int, up: bool = False) -> INPUT:
+    flags = KEYEVENTF_KEYUP if up else 0
+    if vk in _EXTENDED_VKS:
+        flags |= KEYEVENTF_EXTENDEDKEY
+    scan = _user32.MapVirtualKeyW(vk, MAPVK_VK_TO_VSC)
+    return INPUT(type=INPUT_KEYBOARD, ki=KEYBDINPUT(wVk=vk, wScan=scan, dwFlags=flags))
+
+
+def _virtual_screen():
+    """Return (left, top, width - 1, height - 1) of the virtual desktop"""
+    return (
+        _user32.GetSystemMetrics(SM_XVIRTUALSCREEN),
+        _user32.GetSystemMetrics(SM_YVIRTUALSCREEN),
+        max(_user32.GetSystemMetrics(SM_CXVIRTUALSCREEN) - 1, 1),
+        max(_user32.GetSystemMetrics(SM_CYVIRTUALSCREEN) - 1, 1),
+    )
+
+
+def _absolute_move_input(x: int, y: int, screen) -> INPUT:
+    """Build a move to screen pixel (x, y) in SendInput's 0..65535 virtual-desktop space"""
+    left, top, width, height = screen
+    dx = (int(x) - left) * 65535 // width
+    dy = (int(y) - top) * 65535 // height
+    return _mouse_input(_ABSOLUTE_MOVE, dx, dy)
+
+
+def _button_flags(button: str):
+    try:
+        return _BUTTON_FLAGS[button]
+    except KeyError:
+        raise ValueError(f"Unknown mouse button: {button}")
+
+
+def key_to_vk(key: str):
+    """Map a pyautogui-style key name to (virtual-key code, needs_shift)"""
+    name = key.lower()
+    if name in _VK_NAMES:
+        return _VK_NAMES[name], False
+    if len(key) == 1:
+        result = _user32.VkKeyScanW(key)
+        if result == -1:
+            raise ValueError(f"Key has no virtual-key mapping: {key!r}")
+        return result & 0xFF, bool(result & 0x100)
+    raise ValueError(f"Unknown key: {key}")
+
+
+def send_mouse_move(x: int, y: int) -> None:
+    """Move the cursor to absolute screen coordinates"""
+    if not _user32.SetCursorPos(int(x), int(y)):
+        raise ctypes.WinError(ctypes.get_last_error())
+
+
+def send_click_at(x: int, y: int, button: str = "left") -> None:
+    """Move to (x, y) and click as one atomic SendInput batch"""
+    down_flag, up_flag = _button_flags(button)
+    _send([_absolute_move_input(x, y, _virtual_screen()), _mouse_input(down_flag), _mouse_input(up_flag)])
+
+
+def send_drag(start_x: int, start_y: int, end_x: int, end_y: int, button: str = "left") -> None:
+    """Press at the start point, move to the end point and release, in one SendInput batch"""
+    down_flag, up_flag = _button_flags(button)
+    screen = _virtual_screen()
+    _send([
+        _absolute_move_input(start_x, start_y, screen),
+        _mouse_input(down_flag),
+        _absolute_move_input(end_x, end_y, screen),
+        _mouse_input(up_flag),
+    ])
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_hotkey(keys: tuple):
+    """Build the INPUT array for a combo once; repeat sends skip the VK/scancode lookups"""
+    vks = []
+    for key in keys:
+        vk, needs_shift = key_to_vk(key)
+        if needs_shift and VK_SHIFT not in vks:
+            vks.insert(0, VK_SHIFT)
+        vks.append(vk)
+    inputs = [_key_input(vk) for vk in vks] + [_key_input(vk, up=True) for vk in reversed(vks)]
+    return (INPUT * len(inputs))(*inputs)
+
+
+def send_hotkey(keys) -> None:
+    """Press keys in order and release them in reverse, in a single SendInput call"""
+    _send_array(_compile_hotkey(tuple(keys)))